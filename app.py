@@ -284,13 +284,18 @@ def main():
                         "confidence": result.confidence,
                         "reasoning": result.reasoning,
                         "processing_time": result.processing_time,
+                        "cached": result.cached,
+                        "stale": result.stale,
+                        "classifier": result.classifier,
+                        "partial": result.partial,
                         "sources_count": len(result.sources),
                         "sources": [
                             {
                                 "title": s.title,
                                 "label": s.label,
                                 "confidence": s.confidence,
-                                "reasoning": s.reasoning
+                                "reasoning": s.reasoning,
+                                "classifier": s.classifier
                             } for s in result.sources
                         ]
                     }
@@ -0,0 +1,317 @@
+"""
+Segmented on-disk BM25 index for offline evidence retrieval
+
+Layout of an index directory:
+    manifest.json       committed segments with their document and token counts
+    seg-NNNNNN.docs     JSON documents ({"title", "snippet", "link"}) back to back
+    seg-NNNNNN.offsets  uint64 start offset of each document, plus the end offset
+    seg-NNNNNN.lengths  uint32 token count of each document
+    seg-NNNNNN.lexicon  term bytes back to back, in sorted order
+    seg-NNNNNN.terms    one record per term: lexicon offset, term length, postings offset, document frequency
+    seg-NNNNNN.postings (document id, term frequency) uint32 pairs, grouped by term
+
+Segments are immutable and memory-mapped; adding documents writes new
+segments and then swaps the manifest, so readers never see partial data.
+"""
+
+import os
+import sys
+import json
+import math
+import mmap
+import heapq
+import struct
+import logging
+import argparse
+import threading
+from collections import Counter
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from claim_index import claim_tokens
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "manifest.json"
+INDEX_FORMAT = 1
+
+_OFFSET = struct.Struct("<Q")
+_LENGTH = struct.Struct("<I")
+_TERM = struct.Struct("<QIQI")
+_POSTING = struct.Struct("<II")
+
+
+def document_tokens(doc: Dict) -> List[str]:
+    """Indexed tokens of a document: its title and snippet."""
+    return claim_tokens(f"{doc.get('title', '')} {doc.get('snippet', '')}")
+
+
+def _map(path: str):
+    """Read-only memory map of a file (empty files map to b"")."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b""
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def write_segment(directory: str, name: str, docs: List[Dict]) -> int:
+    """Write documents as an immutable segment; returns their total token count."""
+    postings: Dict[str, List[Tuple[int, int]]] = {}
+    total_length = 0
+    base = os.path.join(directory, name)
+
+    with open(f"{base}.docs", "wb") as docs_file, open(f"{base}.offsets", "wb") as offsets_file, \
+            open(f"{base}.lengths", "wb") as lengths_file:
+        position = 0
+        for doc_id, doc in enumerate(docs):
+            tokens = document_tokens(doc)
+            total_length += len(tokens)
+            for term, tf in Counter(tokens).items():
+                postings.setdefault(term, []).append((doc_id, tf))
+
+            data = json.dumps({"title": doc.get("title", ""), "snippet": doc.get("snippet", ""),
+                               "link": doc.get("link", "")}, ensure_ascii=False).encode("utf-8")
+            offsets_file.write(_OFFSET.pack(position))
+            lengths_file.write(_LENGTH.pack(len(tokens)))
+            docs_file.write(data)
+            position += len(data)
+        offsets_file.write(_OFFSET.pack(position))
+
+    with open(f"{base}.lexicon", "wb") as lexicon_file, open(f"{base}.terms", "wb") as terms_file, \
+            open(f"{base}.postings", "wb") as postings_file:
+        lexicon_offset = 0
+        postings_offset = 0
+        for term_bytes, term in sorted((term.encode("utf-8"), term) for term in postings):
+            entries = postings[term]
+            lexicon_file.write(term_bytes)
+            terms_file.write(_TERM.pack(lexicon_offset, len(term_bytes), postings_offset, len(entries)))
+            postings_file.write(b"".join(_POSTING.pack(doc_id, tf) for doc_id, tf in entries))
+            lexicon_offset += len(term_bytes)
+            postings_offset += len(entries)
+
+    return total_length
+
+
+class Segment:
+    """Read-only view of one memory-mapped segment."""
+
+    def __init__(self, directory: str, name: str):
+        base = os.path.join(directory, name)
+        self.name = name
+        self.docs = _map(f"{base}.docs")
+        self.offsets = _map(f"{base}.offsets")
+        self.lengths = _map(f"{base}.lengths")
+        self.lexicon = _map(f"{base}.lexicon")
+        self.terms = _map(f"{base}.terms")
+        self.postings_data = _map(f"{base}.postings")
+        self.doc_count = len(self.lengths) // _LENGTH.size
+        self.term_count = len(self.terms) // _TERM.size
+
+    def _term_at(self, i: int) -> Tuple[bytes, int, int]:
+        lexicon_offset, length, postings_offset, df = _TERM.unpack_from(self.terms, i * _TERM.size)
+        return self.lexicon[lexicon_offset:lexicon_offset + length], postings_offset, df
+
+    def lookup(self, term: str) -> Optional[Tuple[int, int]]:
+        """(postings offset, document frequency) of a term, by binary search over the sorted terms."""
+        target = term.encode("utf-8")
+        lo, hi = 0, self.term_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            term_bytes, postings_offset, df = self._term_at(mid)
+            if term_bytes < target:
+                lo = mid + 1
+            elif term_bytes > target:
+                hi = mid
+            else:
+                return postings_offset, df
+        return None
+
+    def postings(self, postings_offset: int, df: int) -> Iterator[Tuple[int, int]]:
+        start = postings_offset * _POSTING.size
+        return _POSTING.iter_unpack(self.postings_data[start:start + df * _POSTING.size])
+
+    def doc_length(self, doc_id: int) -> int:
+        return _LENGTH.unpack_from(self.lengths, doc_id * _LENGTH.size)[0]
+
+    def document(self, doc_id: int) -> Dict:
+        start = _OFFSET.unpack_from(self.offsets, doc_id * _OFFSET.size)[0]
+        end = _OFFSET.unpack_from(self.offsets, (doc_id + 1) * _OFFSET.size)[0]
+        return json.loads(self.docs[start:end].decode("utf-8"))
+
+
+class BM25Index:
+    """Segmented BM25 index on disk, searchable from many threads while documents are added.
+
+    One writer at a time: add_documents() writes new segments and then
+    atomically replaces the manifest. refresh() picks up segments committed
+    by another process; existing segments are reused, never reopened.
+    """
+
+    def __init__(self, directory: str, k1: float = 1.2, b: float = 0.75):
+        self.directory = directory
+        self.k1 = k1
+        self.b = b
+        self.lock = threading.Lock()
+        self.manifest = {"format": INDEX_FORMAT, "next_segment": 0, "segments": []}
+        self.segments: List[Segment] = []
+        self.doc_count = 0
+        self.total_length = 0
+        self.manifest_state = None
+        self.refresh()
+
+    @property
+    def manifest_path(self) -> str:
+        return os.path.join(self.directory, MANIFEST_NAME)
+
+    def _manifest_state(self):
+        try:
+            stat = os.stat(self.manifest_path)
+            return stat.st_mtime_ns, stat.st_size
+        except OSError:
+            return None
+
+    def refresh(self) -> bool:
+        """Load the manifest if it changed since the last load; True if segments changed."""
+        state = self._manifest_state()
+        if state is None or state == self.manifest_state:
+            return False
+        with self.lock:
+            with open(self.manifest_path, encoding="utf-8") as f:
+                manifest = json.load(f)
+            if manifest.get("format") != INDEX_FORMAT:
+                raise ValueError(f"Unsupported BM25 index format: {manifest.get('format')}")
+            opened = {segment.name: segment for segment in self.segments}
+            segments = [opened.get(entry["name"]) or Segment(self.directory, entry["name"])
+                        for entry in manifest["segments"]]
+            self.manifest = manifest
+            self.segments = segments
+            self.doc_count = sum(entry["docs"] for entry in manifest["segments"])
+            self.total_length = sum(entry["length"] for entry in manifest["segments"])
+            self.manifest_state = state
+        return True
+
+    def add_documents(self, docs: Iterable[Dict], segment_size: int = 100000) -> int:
+        """Index documents in new segments of up to segment_size documents; returns the count added."""
+        os.makedirs(self.directory, exist_ok=True)
+        added = 0
+        batch: List[Dict] = []
+        for doc in docs:
+            batch.append(doc)
+            if len(batch) >= segment_size:
+                added += self._commit_segment(batch)
+                batch = []
+        if batch:
+            added += self._commit_segment(batch)
+        return added
+
+    def _commit_segment(self, docs: List[Dict]) -> int:
+        manifest = json.loads(json.dumps(self.manifest))
+        name = f"seg-{manifest['next_segment']:06d}"
+        length = write_segment(self.directory, name, docs)
+        manifest["next_segment"] += 1
+        manifest["segments"].append({"name": name, "docs": len(docs), "length": length})
+
+        tmp_path = f"{self.manifest_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, self.manifest_path)
+        self.manifest_state = None  # reload even if the file's mtime and size look unchanged
+        self.refresh()
+        logger.info(f"BM25 segment {name} committed: {len(docs)} documents")
+        return len(docs)
+
+    def search(self, query: str, max_results: int = 10) -> List[Tuple[float, Dict]]:
+        """Top documents for the query as (BM25 score, document), best first."""
+        terms = set(claim_tokens(query))
+        with self.lock:
+            segments, doc_count, total_length = self.segments, self.doc_count, self.total_length
+        if not terms or not doc_count:
+            return []
+        average_length = total_length / doc_count
+
+        # Document frequency is global, so every segment scores on the same scale
+        found = {term: [(segment, segment.lookup(term)) for segment in segments] for term in terms}
+        idf = {}
+        for term, hits in found.items():
+            df = sum(hit[1] for _, hit in hits if hit)
+            if df:
+                idf[term] = math.log(1 + (doc_count - df + 0.5) / (df + 0.5))
+
+        k1, b = self.k1, self.b
+        top: List[Tuple[float, int, int]] = []
+        for segment_number, segment in enumerate(segments):
+            scores: Dict[int, float] = {}
+            for term, term_idf in idf.items():
+                hit = found[term][segment_number][1]
+                if not hit:
+                    continue
+                for doc_id, tf in segment.postings(*hit):
+                    norm = k1 * (1 - b + b * segment.doc_length(doc_id) / average_length)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + term_idf * tf * (k1 + 1) / (tf + norm)
+            for doc_id, score in scores.items():
+                entry = (score, -segment_number, -doc_id)
+                if len(top) < max_results:
+                    heapq.heappush(top, entry)
+                elif entry > top[0]:
+                    heapq.heapreplace(top, entry)
+
+        return [(score, segments[-segment_number].document(-doc_id))
+                for score, segment_number, doc_id in sorted(top, reverse=True)]
+
+    def __len__(self) -> int:
+        return self.doc_count
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "segments": len(self.segments),
+            "documents": self.doc_count,
+            "average_length": self.total_length / self.doc_count if self.doc_count else 0.0
+        }
+
+
+def read_corpus(path: str) -> Iterator[Dict]:
+    """Documents from a JSONL corpus; accepts title/snippet/link or DDGS-style title/body/href keys."""
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                logger.warning(f"{path}:{line_number}: skipping malformed record: {e}")
+                continue
+            yield {
+                "title": record.get("title", ""),
+                "snippet": record.get("snippet") or record.get("body") or record.get("text", ""),
+                "link": record.get("link") or record.get("href") or record.get("url", "")
+            }
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Build or query the local BM25 evidence index")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    add = commands.add_parser("add", help="index JSONL corpus files as new segments")
+    add.add_argument("index_dir")
+    add.add_argument("corpus", nargs="+")
+    add.add_argument("--segment-size", type=int, default=100000)
+
+    search = commands.add_parser("search", help="print the top documents for a query")
+    search.add_argument("index_dir")
+    search.add_argument("query")
+    search.add_argument("-n", "--max-results", type=int, default=5)
+
+    args = parser.parse_args(argv)
+    index = BM25Index(args.index_dir)
+    if args.command == "add":
+        for path in args.corpus:
+            added = index.add_documents(read_corpus(path), args.segment_size)
+            print(f"{path}: {added} documents indexed")
+        print(f"Index: {index.stats()}")
+    else:
+        for score, doc in index.search(args.query, args.max_results):
+            print(f"{score:6.2f}  {doc['title']}  {doc['link']}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(main())
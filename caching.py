@@ -0,0 +1,265 @@
+"""
+Caching utilities for the Fact-Checker Agent
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_claim(claim: str) -> str:
+    """Normalize a claim for exact cache lookups (case, whitespace, end punctuation)."""
+    return " ".join(claim.lower().split()).strip(" .!?")
+
+
+def llm_cache_key(model_name: str, prompt: str) -> str:
+    """Content address for an LLM response: hash of model name and prompt text."""
+    return hashlib.sha256(f"{model_name}\0{prompt}".encode("utf-8")).hexdigest()
+
+
+class SQLiteStore:
+    """Thread-safe wrapper around a local SQLite file shared by several processes."""
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, timeout=5.0, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+class SearchCache(SQLiteStore):
+    """On-disk cache of search results with TTL expiry and LRU eviction."""
+
+    def __init__(self, path: str, ttl: float, max_entries: int):
+        super().__init__(path)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        with self.lock:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS search_cache ("
+                "key TEXT PRIMARY KEY, results TEXT NOT NULL, "
+                "created_at REAL NOT NULL, last_access REAL NOT NULL)"
+            )
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_search_cache_last_access ON search_cache(last_access)"
+            )
+
+    def get(self, key: str) -> Optional[List[Dict]]:
+        """Return cached results for the key, or None if missing or expired."""
+        now = time.time()
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT results, created_at FROM search_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            if now - row[1] > self.ttl:
+                self.conn.execute("DELETE FROM search_cache WHERE key = ?", (key,))
+                self.misses += 1
+                return None
+            self.conn.execute("UPDATE search_cache SET last_access = ? WHERE key = ?", (now, key))
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key: str, results: List[Dict]):
+        """Store results for the key and evict least recently used entries over the limit."""
+        now = time.time()
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO search_cache (key, results, created_at, last_access) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(results), now, now)
+            )
+            self.conn.execute("DELETE FROM search_cache WHERE created_at < ?", (now - self.ttl,))
+            count = self.conn.execute("SELECT COUNT(*) FROM search_cache").fetchone()[0]
+            overflow = count - self.max_entries
+            if overflow > 0:
+                self.conn.execute(
+                    "DELETE FROM search_cache WHERE key IN "
+                    "(SELECT key FROM search_cache ORDER BY last_access ASC LIMIT ?)", (overflow,)
+                )
+                self.evictions += overflow
+
+    def clear(self):
+        with self.lock:
+            self.conn.execute("DELETE FROM search_cache")
+
+    def stats(self) -> Dict[str, float]:
+        with self.lock:
+            entries = self.conn.execute("SELECT COUNT(*) FROM search_cache").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "entries": entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+
+class LLMResponseCache(SQLiteStore):
+    """Two-tier LLM response cache: in-memory LRU in front of a size-bounded SQLite file."""
+
+    def __init__(self, path: str, max_memory_entries: int, max_disk_bytes: int):
+        super().__init__(path)
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_bytes = max_disk_bytes
+        self.memory: "OrderedDict[str, str]" = OrderedDict()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        with self.lock:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                "key TEXT PRIMARY KEY, response TEXT NOT NULL, "
+                "size INTEGER NOT NULL, last_access REAL NOT NULL)"
+            )
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_llm_cache_last_access ON llm_cache(last_access)"
+            )
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for the key, checking memory before disk."""
+        with self.lock:
+            if key in self.memory:
+                self.memory.move_to_end(key)
+                self.memory_hits += 1
+                return self.memory[key]
+
+            row = self.conn.execute("SELECT response FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.conn.execute("UPDATE llm_cache SET last_access = ? WHERE key = ?", (time.time(), key))
+            self.disk_hits += 1
+            self._remember(key, row[0])
+            return row[0]
+
+    def put(self, key: str, response: str):
+        """Store a response in both tiers and evict the oldest disk entries over the size limit."""
+        size = len(response.encode("utf-8"))
+        with self.lock:
+            self._remember(key, response)
+            self.conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, response, size, last_access) VALUES (?, ?, ?, ?)",
+                (key, response, size, time.time())
+            )
+            total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_cache").fetchone()[0]
+            if total > self.max_disk_bytes:
+                self._evict(total - self.max_disk_bytes)
+
+    def _remember(self, key: str, response: str):
+        self.memory[key] = response
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.max_memory_entries:
+            self.memory.popitem(last=False)
+
+    def _evict(self, excess: int):
+        freed = 0
+        while freed < excess:
+            rows = self.conn.execute(
+                "SELECT key, size FROM llm_cache ORDER BY last_access ASC LIMIT 64"
+            ).fetchall()
+            if not rows:
+                break
+            for key, size in rows:
+                if freed >= excess:
+                    break
+                self.conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                freed += size
+                self.evictions += 1
+
+    def clear(self):
+        with self.lock:
+            self.memory.clear()
+            self.conn.execute("DELETE FROM llm_cache")
+
+    def stats(self) -> Dict[str, float]:
+        with self.lock:
+            entries, size = self.conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache").fetchone()
+            memory_entries = len(self.memory)
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "memory_entries": memory_entries,
+            "disk_entries": entries,
+            "disk_bytes": size,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0
+        }
+
+
+class ResultCache:
+    """In-memory result cache with a soft TTL (serve stale) and a hard TTL (expire)."""
+
+    def __init__(self, soft_ttl: float, hard_ttl: float, max_entries: int):
+        self.soft_ttl = soft_ttl
+        self.hard_ttl = hard_ttl
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self.lock = threading.Lock()
+        self.fresh_hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Tuple[Optional[Any], bool]:
+        """Return (value, is_stale); value is None on a miss or after the hard TTL."""
+        now = time.time()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or now - entry[1] > self.hard_ttl:
+                self.entries.pop(key, None)
+                self.misses += 1
+                return None, False
+            self.entries.move_to_end(key)
+            stale = now - entry[1] > self.soft_ttl
+            if stale:
+                self.stale_hits += 1
+            else:
+                self.fresh_hits += 1
+            return entry[0], stale
+
+    def put(self, key: str, value: Any):
+        with self.lock:
+            self.entries[key] = (value, time.time())
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def stats(self) -> Dict[str, float]:
+        with self.lock:
+            entries = len(self.entries)
+        lookups = self.fresh_hits + self.stale_hits + self.misses
+        return {
+            "entries": entries,
+            "fresh_hits": self.fresh_hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "hit_rate": (self.fresh_hits + self.stale_hits) / lookups if lookups else 0.0
+        }
@@ -0,0 +1,165 @@
+"""
+Claim canonicalization and near-duplicate lookup (MinHash LSH)
+"""
+
+import re
+import time
+import random
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+STOPWORDS = frozenset("""
+a an the and or but if of at by for with about against between into through during before after
+above below to from up down in out on off over under again further then once here there when where
+why how all any both each few more most other some such only own same so than too very can will just
+is are was were be been being have has had having do does did doing it its this that these those
+i me my we our you your he him his she her they them their what which who whom
+""".split())
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_MERSENNE_PRIME = (1 << 61) - 1
+
+
+def claim_tokens(claim: str) -> List[str]:
+    """Lowercase, strip punctuation and stopwords, and fold simple plurals."""
+    tokens = []
+    for token in _TOKEN_RE.findall(claim.lower()):
+        if token in STOPWORDS:
+            continue
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+def canonicalize_claim(claim: str) -> str:
+    """Canonical form of a claim: its content tokens in order."""
+    return " ".join(claim_tokens(claim))
+
+
+def _token_hash(token: str) -> int:
+    return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+class NearDuplicateIndex:
+    """MinHash LSH index over checked claims with Jaccard verification of candidates.
+
+    Entries older than ttl seconds are never returned and are dropped when
+    met; beyond max_entries the least recently used entry is evicted.
+    """
+
+    def __init__(self, threshold: float = 0.75, num_perm: int = 32, bands: int = 8, seed: int = 1,
+                 ttl: Optional[float] = None, max_entries: int = 0):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.ttl = ttl
+        self.max_entries = max_entries
+        rng = random.Random(seed)
+        self.perms = [(rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME))
+                      for _ in range(num_perm)]
+        self.buckets: List[Dict[Tuple[int, ...], Set[str]]] = [{} for _ in range(bands)]
+        # canonical claim -> (token set, band keys, payload, added at), least recently used first
+        self.entries: "OrderedDict[str, Tuple[frozenset, List[Tuple[int, ...]], Any, float]]" = OrderedDict()
+        self.lock = threading.Lock()
+        self.lookups = 0
+        self.exact_hits = 0
+        self.near_hits = 0
+        self.expired = 0
+        self.evictions = 0
+
+    def _signature(self, token_set: frozenset) -> List[int]:
+        hashes = [_token_hash(token) for token in token_set]
+        return [min((a * h + b) % _MERSENNE_PRIME for h in hashes) for a, b in self.perms]
+
+    def _band_keys(self, signature: List[int]) -> List[Tuple[int, ...]]:
+        return [tuple(signature[i * self.rows:(i + 1) * self.rows]) for i in range(self.bands)]
+
+    def _remove(self, canonical: str):
+        _, band_keys, _, _ = self.entries.pop(canonical)
+        for band, key in enumerate(band_keys):
+            bucket = self.buckets[band][key]
+            bucket.discard(canonical)
+            if not bucket:
+                del self.buckets[band][key]
+
+    def _expired(self, added_at: float, now: float) -> bool:
+        return self.ttl is not None and now - added_at > self.ttl
+
+    def add(self, claim: str, payload: Any):
+        """Index a claim with its payload, replacing the payload of an identical canonical claim."""
+        tokens = claim_tokens(claim)
+        if not tokens:
+            return
+        canonical = " ".join(tokens)
+        token_set = frozenset(tokens)
+        band_keys = self._band_keys(self._signature(token_set))
+
+        with self.lock:
+            if canonical in self.entries:
+                self._remove(canonical)
+            self.entries[canonical] = (token_set, band_keys, payload, time.time())
+            for band, key in enumerate(band_keys):
+                self.buckets[band].setdefault(key, set()).add(canonical)
+            while self.max_entries and len(self.entries) > self.max_entries:
+                self._remove(next(iter(self.entries)))
+                self.evictions += 1
+
+    def lookup(self, claim: str) -> Optional[Tuple[float, Any]]:
+        """Return (similarity, payload) of the most similar indexed claim above the threshold."""
+        tokens = claim_tokens(claim)
+        if not tokens:
+            return None
+        canonical = " ".join(tokens)
+        token_set = frozenset(tokens)
+        now = time.time()
+
+        with self.lock:
+            self.lookups += 1
+            entry = self.entries.get(canonical)
+            if entry is not None:
+                if not self._expired(entry[3], now):
+                    self.entries.move_to_end(canonical)
+                    self.exact_hits += 1
+                    return 1.0, entry[2]
+                self._remove(canonical)
+                self.expired += 1
+
+        band_keys = self._band_keys(self._signature(token_set))
+        best = None
+        with self.lock:
+            candidates = set()
+            for band, key in enumerate(band_keys):
+                candidates.update(self.buckets[band].get(key, ()))
+            for candidate in candidates:
+                other, _, payload, added_at = self.entries[candidate]
+                if self._expired(added_at, now):
+                    self._remove(candidate)
+                    self.expired += 1
+                    continue
+                similarity = len(token_set & other) / len(token_set | other)
+                if similarity >= self.threshold and (best is None or similarity > best[0]):
+                    best = (similarity, payload, candidate)
+            if best is None:
+                return None
+            self.entries.move_to_end(best[2])
+            self.near_hits += 1
+        return best[0], best[1]
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def stats(self) -> Dict[str, float]:
+        with self.lock:
+            return {
+                "entries": len(self.entries),
+                "lookups": self.lookups,
+                "exact_hits": self.exact_hits,
+                "near_hits": self.near_hits,
+                "expired": self.expired,
+                "evictions": self.evictions
+            }
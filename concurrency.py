@@ -0,0 +1,135 @@
+"""
+Concurrency helpers shared by threads and asyncio tasks
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+
+class _Abandoned(Exception):
+    """The shared computation was cancelled before it produced a result."""
+
+
+class SingleFlight:
+    """Coalesce concurrent calls for the same key into one underlying computation.
+
+    The first caller for a key runs the work; callers that arrive while it is
+    in flight wait for the same result, even from other threads or event loops.
+    The work runs as its own task, so cancelling the first caller does not
+    cancel it for the others. If the task is cancelled anyway (e.g. its event
+    loop shuts down), the waiters start over and one of them runs the work.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls: Dict[str, Future] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        while True:
+            with self.lock:
+                future = self.calls.get(key)
+                leader = future is None
+                if leader:
+                    future = Future()
+                    self.calls[key] = future
+                    self.executions += 1
+                else:
+                    self.coalesced += 1
+
+            if leader:
+                task = asyncio.ensure_future(fn())
+                task.add_done_callback(lambda t, f=future: self._settle(key, f, t))
+                # Shielded so a cancelled leader does not cancel the shared computation
+                return await asyncio.shield(task)
+
+            try:
+                return await asyncio.shield(asyncio.wrap_future(future))
+            except _Abandoned:
+                continue
+
+    def _settle(self, key: str, future: Future, task: asyncio.Future):
+        with self.lock:
+            self.calls.pop(key, None)
+        if task.cancelled():
+            future.set_exception(_Abandoned(key))
+        elif task.exception() is not None:
+            future.set_exception(task.exception())
+        else:
+            future.set_result(task.result())
+
+    def stats(self) -> Dict[str, int]:
+        with self.lock:
+            in_flight = len(self.calls)
+        return {
+            "in_flight": in_flight,
+            "executions": self.executions,
+            "coalesced": self.coalesced
+        }
+
+
+class MicroBatcher:
+    """Collect items for a short window and hand them to an async handler as one batch.
+
+    Items may be submitted from any thread or event loop; batches run on the
+    batcher's own event loop thread. The handler returns one result per item,
+    in order; an Exception in that list is raised to that item's submitter.
+    """
+
+    def __init__(self, handler: Callable[[List[Any]], Awaitable[List[Any]]], window: float,
+                 max_batch: int, name: str = "micro-batcher"):
+        self.handler = handler
+        self.window = window
+        self.max_batch = max_batch
+        self.pending: List[Tuple[Any, Future]] = []
+        self.flush_handle: Optional[asyncio.TimerHandle] = None
+        self.batches = 0
+        self.items = 0
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name=name, daemon=True)
+        self.thread.start()
+
+    async def submit(self, item: Any) -> Any:
+        future = Future()
+        self.loop.call_soon_threadsafe(self._enqueue, item, future)
+        return await asyncio.wrap_future(future)
+
+    def _enqueue(self, item: Any, future: Future):
+        self.pending.append((item, future))
+        if len(self.pending) >= self.max_batch:
+            self._flush()
+        elif self.flush_handle is None:
+            self.flush_handle = self.loop.call_later(self.window, self._flush)
+
+    def _flush(self):
+        if self.flush_handle is not None:
+            self.flush_handle.cancel()
+            self.flush_handle = None
+        batch, self.pending = self.pending, []
+        if batch:
+            self.batches += 1
+            self.items += len(batch)
+            self.loop.create_task(self._run(batch))
+
+    async def _run(self, batch: List[Tuple[Any, Future]]):
+        try:
+            results = await self.handler([item for item, _ in batch])
+        except Exception as e:
+            results = [e] * len(batch)
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "average_batch_size": self.items / self.batches if self.batches else 0.0
+        }
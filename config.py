@@ -11,9 +11,95 @@ GEMINI_API_KEY = os.getenv("GEMINI_API_KEY", "")
 
 # Search Configuration
 MAX_SEARCH_RESULTS = 6
-SEARCH_TIMEOUT = 10
+SEARCH_TIMEOUT = 10  # seconds; overall deadline for a live search before falling back
+SEARCH_HEDGING = True  # re-issue a slow search once and take whichever answers first
+SEARCH_HEDGE_PERCENTILE = 0.95  # hedge after this quantile of observed search latency
+SEARCH_HEDGE_DEFAULT_DELAY = 2.0  # seconds, until enough latencies are observed
+SEARCH_HEDGE_MIN_SAMPLES = 20
+SEARCH_BREAKER_FAILURES = 3  # consecutive failures/timeouts that open the circuit
+SEARCH_BREAKER_COOLDOWN = 30  # seconds to serve the fallback before probing again
+SEARCH_FANOUT = False  # query every SEARCH_BACKENDS entry concurrently and merge results by URL
+SEARCH_BACKENDS = ["duckduckgo", "bm25", "archive"]  # "demo" adds the canned demo evidence
+SEARCH_FANOUT_QUORUM = 4  # return once this many distinct valid results are in (capped at max_results)
+SEARCH_FANOUT_LIVE_GRACE = 1.0  # seconds to keep waiting for live search when local results alone meet the quorum
+ARCHIVE_PATH = os.getenv("FACT_CHECKER_ARCHIVE_PATH", "archive.jsonl")  # local stand-in for the fact-check archive
+BM25_INDEX_DIR = os.getenv("FACT_CHECKER_BM25_INDEX", "bm25_index")  # build with: python bm25_index.py add DIR corpus.jsonl
+BM25_K1 = 1.2
+BM25_B = 0.75
+STREAMING_PIPELINE = False  # classify sources while the search is still returning them
+ADAPTIVE_SEARCH = False  # start small and fetch more results only while the verdict is uncertain
+ADAPTIVE_INITIAL_RESULTS = 3
+ADAPTIVE_PAGE_SIZE = 3
+ADAPTIVE_MAX_SOURCES = 12
+ADAPTIVE_MAX_ROUNDS = 3
+
+# Classification Configuration
+CLASSIFY_CHUNK_SIZE = 2  # sources per classification call in streaming/early-exit mode
+# Stop classifying once remaining sources cannot change the verdict. Off by default: it splits
+# classification into per-chunk calls, and True/False verdicts only settle on the last chunk
+EARLY_EXIT_ENABLED = False
+EARLY_EXIT_PARALLEL_CHUNKS = 2
+CLASSIFICATION_CASCADE = False  # keyword classifier first, Gemini only for unclear sources (changes labels)
+CASCADE_ACCEPT_CONFIDENCE = 0.8  # keyword labels at or above this skip Gemini
+
+# Deadline Configuration (process_claim(..., deadline=seconds))
+DEADLINE_RESERVE = 0.2  # seconds kept back for keyword labels, aggregation and the template post
+DEADLINE_MIN_SEARCH_BUDGET = 1.0  # below this, no further adaptive search rounds
+DEADLINE_MIN_LLM_BUDGET = 2.0  # below this, Gemini is skipped for classification and posts
+
+# Batch Processing Configuration
+BATCH_MAX_CONCURRENCY = 8
+ASYNC_IO_WORKERS = 64
+
+# Cache Configuration
+CACHE_DIR = os.getenv("FACT_CHECKER_CACHE_DIR", ".cache")
+SEARCH_CACHE_ENABLED = True
+SEARCH_CACHE_PATH = os.path.join(CACHE_DIR, "search_cache.sqlite3")
+SEARCH_CACHE_TTL = 6 * 60 * 60  # seconds
+SEARCH_CACHE_MAX_ENTRIES = 10000
+LLM_CACHE_ENABLED = True
+LLM_CACHE_PATH = os.path.join(CACHE_DIR, "llm_cache.sqlite3")
+LLM_CACHE_MEMORY_ENTRIES = 1024
+LLM_CACHE_MAX_BYTES = 64 * 1024 * 1024
+NEAR_DUPLICATE_ENABLED = True
+NEAR_DUPLICATE_THRESHOLD = 0.75  # minimum Jaccard similarity of canonical claim tokens
+NEAR_DUPLICATE_NUM_PERM = 32
+NEAR_DUPLICATE_BANDS = 8
+NEAR_DUPLICATE_MAX_ENTRIES = 10000  # least recently used claims beyond this are dropped
+RESULT_CACHE_ENABLED = True
+RESULT_CACHE_SOFT_TTL = 5 * 60  # serve cached result, refresh in background
+RESULT_CACHE_HARD_TTL = 60 * 60  # recompute before answering
+RESULT_CACHE_MAX_ENTRIES = 1000
+RESULT_CACHE_REFRESH_WORKERS = 2
+
+# Rate Limiting Configuration (rate in requests/second; 0 disables a limit)
+GEMINI_RATE_LIMIT = 1.0
+GEMINI_RATE_BURST = 5
+GEMINI_MAX_CONCURRENCY = 4
+SEARCH_RATE_LIMIT = 1.0
+SEARCH_RATE_BURST = 3
+SEARCH_MAX_CONCURRENCY = 4
+RATE_LIMIT_BACKEND = os.getenv("FACT_CHECKER_RATE_LIMIT_BACKEND", "memory")  # "memory" or "sqlite" (host-wide)
+RATE_LIMIT_DB_PATH = os.path.join(CACHE_DIR, "rate_limits.sqlite3")
+
+# Keyword Classifier Configuration
+KEYWORD_LEXICON_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "keyword_lexicon.json")
+LEXICON_SNAPSHOT_DIR = os.path.join(CACHE_DIR, "lexicon")
+LEXICON_RELOAD_INTERVAL = 5  # seconds between lexicon file change checks; 0 disables reloads
 
 # Model Configuration
+GEMINI_MODEL_NAME = "gemini-pro"
+GEMINI_MICRO_BATCHING = False  # pack concurrent claims' classification into one Gemini call
+GEMINI_BATCH_WINDOW = 0.02  # seconds to wait for more claims before sending a batch
+GEMINI_BATCH_MAX_CLAIMS = 4
+GEMINI_JSON_MODE = True  # request application/json output for structured prompts
+GEMINI_FUSED_MODE = False  # one Gemini call for source labels and per-verdict post drafts
+GEMINI_TIMEOUT = 15  # seconds per Gemini call before it counts as failed
+GEMINI_LATENCY_SLO = 8.0  # p95 seconds; above this new work goes to the keyword classifier
+GEMINI_MAX_ERROR_RATE = 0.2
+GEMINI_SLO_WINDOW = 50  # recent Gemini calls considered
+GEMINI_SLO_MIN_SAMPLES = 10
+GEMINI_PROBE_INTERVAL = 30  # seconds between Gemini probes while degraded
 NLI_MODEL_NAME = "cross-encoder/nli-deberta-v3-base"
 CONFIDENCE_THRESHOLD = 0.5
 
@@ -0,0 +1,75 @@
+"""
+Inverted index for matching claims against curated offline evidence
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class DemoSourceIndex:
+    """Token index over curated entries keyed by space-separated keywords.
+
+    Scores match the original linear scan: +1 for every entry keyword found
+    anywhere in the claim and +0.5 for every claim word that is a substring of
+    one of the entry's keywords. Lookup cost depends on claim length only.
+    """
+
+    def __init__(self, entries: Dict[str, Any]):
+        self.entries: List[Any] = []
+        # keyword -> [(entry id, occurrences of the keyword in the entry key)]
+        self.keyword_postings: Dict[str, List[Tuple[int, int]]] = {}
+        # any substring of any keyword -> entry ids whose keywords contain it
+        self.substring_postings: Dict[str, List[int]] = {}
+        self.max_keyword_length = 0
+
+        for entry_id, (key, data) in enumerate(entries.items()):
+            self.entries.append(data)
+            keywords = key.split()
+
+            counts: Dict[str, int] = {}
+            for keyword in keywords:
+                counts[keyword] = counts.get(keyword, 0) + 1
+                self.max_keyword_length = max(self.max_keyword_length, len(keyword))
+            for keyword, count in counts.items():
+                self.keyword_postings.setdefault(keyword, []).append((entry_id, count))
+
+            substrings = set()
+            for keyword in keywords:
+                for start in range(len(keyword)):
+                    for end in range(start + 1, len(keyword) + 1):
+                        substrings.add(keyword[start:end])
+            for substring in substrings:
+                self.substring_postings.setdefault(substring, []).append(entry_id)
+
+    def scores(self, claim: str) -> Dict[int, float]:
+        """Match score per entry id for every entry with a non-zero score."""
+        claim_lower = claim.lower()
+        words = claim_lower.split()
+        scores: Dict[int, float] = {}
+
+        # Keywords never contain whitespace, so each occurrence lies inside one claim word
+        matched = set()
+        for word in words:
+            for start in range(len(word)):
+                for end in range(start + 1, min(len(word), start + self.max_keyword_length) + 1):
+                    if word[start:end] in self.keyword_postings:
+                        matched.add(word[start:end])
+        for keyword in matched:
+            for entry_id, count in self.keyword_postings[keyword]:
+                scores[entry_id] = scores.get(entry_id, 0) + count
+
+        # Bonus for partial matches
+        for word in words:
+            for entry_id in self.substring_postings.get(word, ()):
+                scores[entry_id] = scores.get(entry_id, 0) + 0.5
+
+        return scores
+
+    def best_match(self, claim: str, min_score: float = 1) -> Optional[Tuple[Any, float]]:
+        """Highest scoring entry (earliest entry on ties), or None below min_score."""
+        scores = self.scores(claim)
+        if not scores:
+            return None
+        entry_id = min(scores, key=lambda i: (-scores[i], i))
+        if scores[entry_id] < min_score:
+            return None
+        return self.entries[entry_id], scores[entry_id]
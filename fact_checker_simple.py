@@ -5,9 +5,13 @@ Works reliably without external AI models for hackathon demo
 
 import json
 import time
+import asyncio
 import logging
-from typing import Dict, List, Tuple, Optional
-from dataclasses import dataclass
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Tuple, Optional
+from dataclasses import dataclass, replace
 
 # Try to import optional dependencies
 try:
@@ -17,17 +21,66 @@ except ImportError:
     GEMINI_AVAILABLE = False
 
 try:
-    from duckduckgo_search import DDGS
-    DUCKDUCKGO_AVAILABLE = True
+    import numpy as np
+    NUMPY_AVAILABLE = True
 except ImportError:
-    DUCKDUCKGO_AVAILABLE = False
+    NUMPY_AVAILABLE = False
 
 from config import *
+from caching import LLMResponseCache, ResultCache, SearchCache, llm_cache_key, normalize_claim
+from claim_index import NearDuplicateIndex
+from concurrency import MicroBatcher, SingleFlight
+from evidence_index import DemoSourceIndex
+from keyword_matcher import LexiconManager
+from rate_limiting import BackendLimiter, LimiterTimeout, SQLiteTokenBucket, TokenBucket
+from resilience import CircuitBreaker, LatencyTracker, SLOController
+from search_backends import (DUCKDUCKGO_AVAILABLE, ArchiveBackend, DemoCorpusBackend, DuckDuckGoBackend,
+                             LocalBM25Backend, SearchBackend, merge_results)
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def _run_sync(coro):
+    """Run a coroutine to completion from synchronous code.
+
+    Every call gets a fresh event loop, so clients reused across calls must
+    not be bound to a loop (Gemini runs its blocking client on the I/O executor).
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+
+    # Called from inside a running event loop: finish the work on a helper thread
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
+def extract_json_object(text: str) -> Dict:
+    """Recover the first JSON object from LLM output wrapped in fences or prose."""
+    text = text.strip()
+    try:
+        result = json.loads(text)
+        if isinstance(result, dict):
+            return result
+    except ValueError:
+        pass
+    return _scan_json_object(text)
+
+def _scan_json_object(text: str) -> Dict:
+    """First JSON object embedded anywhere in the text."""
+    decoder = json.JSONDecoder()
+    start = text.find("{")
+    while start != -1:
+        try:
+            result, _ = decoder.raw_decode(text, start)
+            if isinstance(result, dict):
+                return result
+        except ValueError:
+            pass
+        start = text.find("{", start + 1)
+    raise ValueError(f"No JSON object found in response: {text[:80]!r}")
+
 @dataclass
 class Source:
     title: str
@@ -36,6 +89,7 @@ class Source:
     label: str = ""
     confidence: float = 0.0
     reasoning: str = ""
+    classifier: str = ""  # "gemini" or "keywords"
 
 @dataclass
 class FactCheckResult:
@@ -46,6 +100,85 @@ class FactCheckResult:
     reasoning: str
     social_post: str
     processing_time: float
+    cached: bool = False
+    stale: bool = False
+    classifier: str = ""  # "gemini", "keywords" or "mixed"
+    partial: bool = False  # the deadline forced some stage to cut work short
+
+class Deadline:
+    """Time budget for one claim; stages check it and record when they had to cut work short."""
+
+    def __init__(self, seconds: float):
+        self.expires_at = time.monotonic() + seconds
+        self.cut_short = False
+
+    def budget(self) -> float:
+        """Seconds left for optional work, keeping DEADLINE_RESERVE for the local finish."""
+        return max(0.0, self.expires_at - time.monotonic() - DEADLINE_RESERVE)
+
+    def allows(self, min_budget: float) -> bool:
+        """Whether at least min_budget seconds remain; records a cut when not."""
+        if self.budget() >= min_budget:
+            return True
+        self.cut_short = True
+        return False
+
+def _budget(deadline: Optional[Deadline]) -> Optional[float]:
+    """Timeout for the next awaited stage; None when the claim has no deadline."""
+    return None if deadline is None else deadline.budget()
+
+@dataclass
+class ClaimOptions:
+    """Per-call switches threaded through the claim pipeline."""
+    stream: bool = STREAMING_PIPELINE
+    full_classification: bool = False  # audit runs: never stop classifying early
+    adaptive: bool = ADAPTIVE_SEARCH
+    deadline: Optional[Deadline] = None
+
+def verdict_bucket(support_count: int, refute_count: int) -> str:
+    """Verdict implied by support/refute counts (see aggregate_verdict)."""
+    if support_count >= 2 and refute_count == 0:
+        return "True"
+    if refute_count >= 2 and support_count == 0:
+        return "False"
+    if support_count >= 1 and refute_count >= 1:
+        return "Misleading"
+    return "Unverified"
+
+def classifier_summary(sources: List[Source]) -> str:
+    """Which classifier labeled the sources: "gemini", "keywords" or "mixed"."""
+    used = {source.classifier for source in sources if source.classifier}
+    if len(used) > 1:
+        return "mixed"
+    return used.pop() if used else ""
+
+class IncrementalVerdict:
+    """Running support/refute counts that tell when the verdict can no longer change.
+
+    The verdict is settled once every possible labelling of the sources still
+    unclassified leads to the same verdict bucket.
+    """
+
+    def __init__(self, expected_sources: int):
+        self.remaining = expected_sources
+        self.support_count = 0
+        self.refute_count = 0
+
+    def add(self, sources: List[Source]):
+        for source in sources:
+            self.remaining = max(0, self.remaining - 1)
+            if source.label == "supports":
+                self.support_count += 1
+            elif source.label == "refutes":
+                self.refute_count += 1
+
+    def settled(self) -> bool:
+        current = verdict_bucket(self.support_count, self.refute_count)
+        for supports in range(self.remaining + 1):
+            for refutes in range(self.remaining - supports + 1):
+                if verdict_bucket(self.support_count + supports, self.refute_count + refutes) != current:
+                    return False
+        return True
 
 # Enhanced demo data for comprehensive fact-checking
 DEMO_SOURCES = {
@@ -147,18 +280,118 @@ DEMO_SOURCES = {
 }
 
 class FactCheckerPipeline:
-    def __init__(self):
-        """Initialize the fact-checker pipeline."""
+    def __init__(self, demo_sources: Optional[Dict] = None):
+        """Initialize the fact-checker pipeline, optionally with a custom offline corpus."""
+        self.last_batch_stats: Dict[str, float] = {}
+        self.stats_lock = threading.Lock()
+        self.cascade_counts = {"sources": 0, "accepted_locally": 0, "llm_calls_avoided": 0, "tokens_avoided": 0}
+        self.json_stats = {"clean": 0, "repaired": 0, "failed": 0}
+        self.setup_rate_limits()
+        # Blocking clients (DDGS) run here so the event loop never waits on them
+        self.io_executor = ThreadPoolExecutor(max_workers=ASYNC_IO_WORKERS, thread_name_prefix="fact-check-io")
+        # Live search trips to the demo fallback while DuckDuckGo keeps failing
+        self.search_breaker = CircuitBreaker(SEARCH_BREAKER_FAILURES, SEARCH_BREAKER_COOLDOWN)
+        self.search_latency = LatencyTracker(min_samples=SEARCH_HEDGE_MIN_SAMPLES)
+        self.search_hedges = 0
+        self.search_hedges_skipped = 0
+        # Concurrent requests for the same normalized claim share one computation
+        self.single_flight = SingleFlight()
+        self.demo_index = DemoSourceIndex(demo_sources if demo_sources is not None else DEMO_SOURCES)
+        self.setup_search_backends()
+        self.lexicon = LexiconManager(KEYWORD_LEXICON_PATH, LEXICON_SNAPSHOT_DIR, LEXICON_RELOAD_INTERVAL)
         self.setup_gemini()
+        self.setup_caches()
         
+    def setup_rate_limits(self):
+        """Per-backend request rate and concurrency limits shared by all threads and tasks."""
+        self.gemini_limiter = BackendLimiter(
+            "gemini", GEMINI_RATE_LIMIT, GEMINI_RATE_BURST, GEMINI_MAX_CONCURRENCY,
+            bucket=self._rate_bucket("gemini", GEMINI_RATE_LIMIT, GEMINI_RATE_BURST))
+        self.search_limiter = BackendLimiter(
+            "search", SEARCH_RATE_LIMIT, SEARCH_RATE_BURST, SEARCH_MAX_CONCURRENCY,
+            bucket=self._rate_bucket("search", SEARCH_RATE_LIMIT, SEARCH_RATE_BURST))
+
+    def _rate_bucket(self, name: str, rate: float, burst: float) -> Optional[TokenBucket]:
+        """Token bucket for a backend: host-wide in SQLite if configured, else in-process."""
+        if rate <= 0:
+            return None
+        if RATE_LIMIT_BACKEND == "sqlite":
+            try:
+                return SQLiteTokenBucket(RATE_LIMIT_DB_PATH, name, rate, burst)
+            except Exception as e:
+                logger.warning(f"Shared rate limit store unavailable, limiting per process: {e}")
+        return TokenBucket(rate, burst)
+
+    def limiter_stats(self) -> Dict[str, Dict[str, float]]:
+        """Queue-wait statistics per rate-limited backend."""
+        return {"gemini": self.gemini_limiter.stats(), "search": self.search_limiter.stats()}
+
+    def setup_search_backends(self):
+        """Build the SEARCH_BACKENDS used by fan-out search, each behind its own circuit breaker."""
+        self.duckduckgo = DuckDuckGoBackend(self.search_limiter, SEARCH_TIMEOUT)
+        # Offline retrieval, also used ahead of the demo data when live search fails
+        self.bm25 = None
+        try:
+            bm25 = LocalBM25Backend(BM25_INDEX_DIR, BM25_K1, BM25_B)
+            if bm25.available():
+                self.bm25 = bm25
+        except Exception as e:
+            logger.warning(f"Local BM25 index unavailable: {e}")
+        known = {
+            "duckduckgo": lambda: self.duckduckgo,
+            "bm25": lambda: self.bm25,
+            "demo": lambda: DemoCorpusBackend(self.demo_index),
+            "archive": lambda: ArchiveBackend(ARCHIVE_PATH),
+        }
+        self.search_backends: List[SearchBackend] = []
+        for name in SEARCH_BACKENDS:
+            if name not in known:
+                logger.warning(f"Unknown search backend '{name}' ignored")
+                continue
+            backend = known[name]()
+            if backend is not None and backend.available():
+                self.search_backends.append(backend)
+            else:
+                logger.info(f"Search backend '{name}' unavailable")
+        # DuckDuckGo shares the breaker used by the single-backend path
+        self.backend_breakers = {
+            backend.name: self.search_breaker if backend is self.duckduckgo
+            else CircuitBreaker(SEARCH_BREAKER_FAILURES, SEARCH_BREAKER_COOLDOWN)
+            for backend in self.search_backends
+        }
+
+    def search_health(self) -> Dict[str, Dict[str, float]]:
+        """Circuit breaker state, per-request latency and hedging counts for live search."""
+        return {
+            "breaker": self.search_breaker.stats(),
+            "latency": self.search_latency.stats(),
+            "hedging": {"hedges": self.search_hedges, "skipped": self.search_hedges_skipped},
+            "backends": {name: breaker.stats() for name, breaker in self.backend_breakers.items()}
+        }
+
+    def gemini_health(self) -> Dict[str, float]:
+        """Rolling Gemini latency/error window and SLO degradation state."""
+        return self.gemini_slo.stats()
+
     def setup_gemini(self):
         """Configure Gemini API if available."""
         self.use_gemini = False
+        self.gemini_batcher = None
+        # Routes new Gemini work to the keyword classifier while Gemini is outside its SLO
+        self.gemini_slo = SLOController("Gemini", GEMINI_LATENCY_SLO, GEMINI_MAX_ERROR_RATE,
+                                        window=GEMINI_SLO_WINDOW, min_samples=GEMINI_SLO_MIN_SAMPLES,
+                                        probe_interval=GEMINI_PROBE_INTERVAL)
+        self.gemini_json_mode = GEMINI_JSON_MODE
+        self.classification_cascade = CLASSIFICATION_CASCADE
         if GEMINI_AVAILABLE and GEMINI_API_KEY:
             try:
                 genai.configure(api_key=GEMINI_API_KEY)
-                self.gemini_model = genai.GenerativeModel('gemini-pro')
+                self.gemini_model = genai.GenerativeModel(GEMINI_MODEL_NAME)
                 self.use_gemini = True
+                if GEMINI_MICRO_BATCHING:
+                    self.gemini_batcher = MicroBatcher(self._classify_batch_with_gemini_async,
+                                                       GEMINI_BATCH_WINDOW, GEMINI_BATCH_MAX_CLAIMS,
+                                                       name="gemini-batcher")
                 logger.info("Gemini API configured successfully")
             except Exception as e:
                 logger.warning(f"Gemini setup failed: {e}")
@@ -166,64 +399,494 @@ class FactCheckerPipeline:
         else:
             logger.info("Using fallback methods (no Gemini API)")
 
-    def search_claim(self, claim: str, max_results: int = MAX_SEARCH_RESULTS) -> List[Source]:
+    def setup_caches(self):
+        """Open the on-disk caches, falling back to uncached operation on failure."""
+        self.search_cache = None
+        if SEARCH_CACHE_ENABLED:
+            try:
+                self.search_cache = SearchCache(SEARCH_CACHE_PATH, SEARCH_CACHE_TTL, SEARCH_CACHE_MAX_ENTRIES)
+            except Exception as e:
+                logger.warning(f"Search cache unavailable: {e}")
+
+        self.llm_cache = None
+        if LLM_CACHE_ENABLED:
+            try:
+                self.llm_cache = LLMResponseCache(LLM_CACHE_PATH, LLM_CACHE_MEMORY_ENTRIES, LLM_CACHE_MAX_BYTES)
+            except Exception as e:
+                logger.warning(f"LLM cache unavailable: {e}")
+
+        # Evidence of previously checked claims, reused for near-duplicate phrasings
+        self.claim_index = None
+        if NEAR_DUPLICATE_ENABLED:
+            # Reused evidence expires with the search cache it mirrors
+            self.claim_index = NearDuplicateIndex(NEAR_DUPLICATE_THRESHOLD, NEAR_DUPLICATE_NUM_PERM,
+                                                  NEAR_DUPLICATE_BANDS, ttl=SEARCH_CACHE_TTL,
+                                                  max_entries=NEAR_DUPLICATE_MAX_ENTRIES)
+
+        self.result_cache = None
+        if RESULT_CACHE_ENABLED:
+            self.result_cache = ResultCache(RESULT_CACHE_SOFT_TTL, RESULT_CACHE_HARD_TTL, RESULT_CACHE_MAX_ENTRIES)
+            self.refresh_executor = ThreadPoolExecutor(max_workers=RESULT_CACHE_REFRESH_WORKERS,
+                                                       thread_name_prefix="fact-check-refresh")
+            self.refreshing = set()
+            self.refresh_lock = threading.Lock()
+
+    def cache_stats(self) -> Dict[str, Dict[str, float]]:
+        """Hit/miss statistics for every enabled cache."""
+        stats = {}
+        if self.search_cache:
+            stats["search"] = self.search_cache.stats()
+        if self.llm_cache:
+            stats["llm"] = self.llm_cache.stats()
+        if self.result_cache:
+            stats["result"] = self.result_cache.stats()
+        if self.claim_index is not None:
+            stats["near_duplicate"] = self.claim_index.stats()
+        return stats
+
+    async def _gemini_generate_async(self, prompt: str, json_mode: bool = False,
+                                     parse: Optional[Callable[[str], Any]] = None) -> Any:
+        """Call Gemini for the prompt, answering repeated prompts from the LLM cache.
+
+        json_mode requests JSON output from the API when the model supports it.
+        parse, if given, is applied to the reply and its result returned; a
+        reply it rejects is not cached, so the prompt is retried next time.
+        """
+        json_mode = json_mode and self.gemini_json_mode
+        cache_key = llm_cache_key(f"{GEMINI_MODEL_NAME}|json" if json_mode else GEMINI_MODEL_NAME, prompt)
+        if self.llm_cache:
+            # A disk-tier lookup can wait on another process holding the SQLite lock
+            cached = await asyncio.to_thread(self.llm_cache.get, cache_key)
+            if cached is not None:
+                return parse(cached) if parse else cached
+
+        if json_mode:
+            try:
+                response = await self._timed_gemini_call(
+                    prompt, generation_config={"response_mime_type": "application/json"})
+            except Exception as e:
+                if "mime" not in str(e).lower() and type(e).__name__ != "InvalidArgument":
+                    raise
+                # Older models reject JSON mode; stop asking for it and rely on the extractor
+                logger.warning(f"Gemini JSON mode unavailable, using plain output: {e}")
+                self.gemini_json_mode = False
+                return await self._gemini_generate_async(prompt, parse=parse)
+        else:
+            response = await self._timed_gemini_call(prompt)
+        text = response.text
+        result = parse(text) if parse else text
+        if self.llm_cache:
+            await asyncio.to_thread(self.llm_cache.put, cache_key, text)
+        return result
+
+    async def _timed_gemini_call(self, prompt: str, **kwargs):
+        """One rate-limited Gemini API call bounded by GEMINI_TIMEOUT; feeds the SLO controller.
+
+        The blocking client runs on the I/O executor: the model's async client
+        is bound to the event loop it was first used on, while sync callers get
+        a fresh loop per call and the micro-batcher runs its own.
+        """
+        loop = asyncio.get_running_loop()
+        async with self.gemini_limiter:
+            start = time.monotonic()
+            try:
+                response = await asyncio.wait_for(
+                    loop.run_in_executor(self.io_executor,
+                                         functools.partial(self.gemini_model.generate_content, prompt, **kwargs)),
+                    GEMINI_TIMEOUT)
+            except asyncio.TimeoutError:
+                self.gemini_slo.record(time.monotonic() - start, ok=False)
+                raise TimeoutError(f"Gemini call exceeded {GEMINI_TIMEOUT}s")
+            except Exception:
+                self.gemini_slo.record(time.monotonic() - start, ok=False)
+                raise
+            self.gemini_slo.record(time.monotonic() - start, ok=True)
+            return response
+
+    def _parse_gemini_json(self, response_text: str) -> Dict:
+        """Parse a Gemini JSON reply, repairing fenced or prefixed output; records parse outcomes."""
+        try:
+            result = json.loads(response_text.strip())
+            outcome = "clean" if isinstance(result, dict) else None
+        except ValueError:
+            outcome = None
+        if outcome is None:
+            try:
+                result = _scan_json_object(response_text)
+                outcome = "repaired"
+            except ValueError:
+                outcome = "failed"
+
+        with self.stats_lock:
+            self.json_stats[outcome] += 1
+        if outcome == "failed":
+            raise ValueError(f"Unparseable Gemini response: {response_text[:80]!r}")
+        return result
+
+    def cascade_stats(self) -> Dict[str, float]:
+        """Sources labeled locally by the classification cascade and the Gemini work it avoided."""
+        with self.stats_lock:
+            stats = dict(self.cascade_counts)
+        stats["local_rate"] = stats["accepted_locally"] / stats["sources"] if stats["sources"] else 0.0
+        return stats
+
+    def json_parse_stats(self) -> Dict[str, float]:
+        """Counts of clean, repaired and failed Gemini JSON parses, with the failure rate."""
+        with self.stats_lock:
+            stats = dict(self.json_stats)
+        total = sum(stats.values())
+        stats["failure_rate"] = stats["failed"] / total if total else 0.0
+        return stats
+
+    def search_claim(self, claim: str, max_results: int = MAX_SEARCH_RESULTS,
+                     use_cache: bool = True) -> List[Source]:
         """Search for information about the claim."""
+        return _run_sync(self.search_claim_async(claim, max_results, use_cache))
+
+    async def search_claim_async(self, claim: str, max_results: int = MAX_SEARCH_RESULTS,
+                                 use_cache: bool = True) -> List[Source]:
+        """Search for information about the claim without blocking the event loop."""
+        sources, _ = await self._search_with_origin(claim, max_results, use_cache)
+        return sources
+
+    async def _search_with_origin(self, claim: str, max_results: int,
+                                  use_cache: bool = True) -> Tuple[List[Source], bool]:
+        """Search for the claim; the flag tells whether the demo fallback was used."""
+        cache_key = f"{max_results}|{normalize_claim(claim)}"
+        if use_cache:
+            # The caches are SQLite files shared with other processes; lookups can wait on their locks
+            cached = await asyncio.to_thread(self._cached_sources, claim, cache_key, max_results)
+            if cached is not None:
+                return cached, False
         
-        # Try real search first
-        if DUCKDUCKGO_AVAILABLE:
+        # Fan-out queries every configured backend; otherwise DuckDuckGo unless its breaker is open
+        if SEARCH_FANOUT and self.search_backends:
+            results, live = await self._fan_out_search(claim, max_results)
+            sources = self._parse_search_results(results)
+            if sources:
+                logger.info(f"Found {len(sources)} sources across backends")
+                # Local evidence alone is not cached, so the live backend is retried next time
+                if live:
+                    await asyncio.to_thread(self._remember_sources, claim, cache_key, max_results, sources)
+                return sources, False
+        elif DUCKDUCKGO_AVAILABLE and self.search_breaker.allow():
             try:
-                sources = []
-                with DDGS() as ddgs:
-                    search_results = ddgs.text(claim, max_results=max_results)
-                    
-                    for result in search_results:
-                        source = Source(
-                            title=result.get("title", "")[:200],
-                            snippet=result.get("body", "")[:500],
-                            link=result.get("href", "")
-                        )
-                        
-                        if source.title and source.snippet and source.link:
-                            sources.append(source)
+                search_results = await self._hedged_search(claim, max_results)
+            except LimiterTimeout as e:
+                # Our own queue was full; the backend was never asked, so the breaker is left alone
+                logger.warning(f"Real search not sent: {e}")
+            except Exception as e:
+                self.search_breaker.record_failure()
+                logger.warning(f"Real search failed: {e or type(e).__name__}")
+            else:
+                self.search_breaker.record_success()
+                sources = self._parse_search_results(search_results)
                 
                 if sources:
                     logger.info(f"Found {len(sources)} real sources")
-                    return sources
-                    
+                    await asyncio.to_thread(self._remember_sources, claim, cache_key, max_results, sources)
+                    return sources, False
+        
+        # Offline evidence from the local index before the canned demo data
+        if self.bm25 is not None and not (SEARCH_FANOUT and self.bm25 in self.search_backends):
+            loop = asyncio.get_running_loop()
+            sources = await loop.run_in_executor(self.io_executor, self._local_index_sources, claim, max_results)
+            if sources:
+                return sources, False
+
+        # Fallback to demo data
+        return self._get_demo_sources(claim), True
+
+    async def _fan_out_search(self, claim: str, max_results: int) -> Tuple[List[Dict], bool]:
+        """Query every search backend concurrently and merge their valid results by URL.
+
+        Returns once SEARCH_FANOUT_QUORUM distinct valid results are in, every
+        backend has answered, or SEARCH_TIMEOUT has passed, whichever comes
+        first. A quorum met by local backends alone waits up to
+        SEARCH_FANOUT_LIVE_GRACE longer for a live backend still running.
+        Live results come first. Backends with an open circuit breaker are
+        skipped. The flag tells whether a live backend contributed any of the
+        returned results.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = time.monotonic() + SEARCH_TIMEOUT
+        quorum = min(SEARCH_FANOUT_QUORUM, max_results)
+
+        def settle(future, breaker: CircuitBreaker, name: str):
+            # Runs on the worker thread, so late answers still update the breaker
+            if future.cancelled():
+                return
+            if future.exception() is None:
+                breaker.record_success()
+            else:
+                breaker.record_failure()
+                logger.warning(f"Search backend '{name}' failed: {future.exception()}")
+
+        backends = {}
+        for backend in self.search_backends:
+            breaker = self.backend_breakers[backend.name]
+            if not breaker.allow():
+                continue
+            future = self.io_executor.submit(backend.search, claim, max_results)
+            future.add_done_callback(lambda f, b=breaker, n=backend.name: settle(f, b, n))
+            backends[asyncio.wrap_future(future, loop=loop)] = backend
+
+        live_results: List[Dict] = []
+        local_results: List[Dict] = []
+        seen = set()
+        answered = []
+        pending = set(backends)
+        grace_until = None
+        while pending:
+            now = time.monotonic()
+            limit = deadline
+            if len(live_results) + len(local_results) >= quorum:
+                if live_results or not any(backends[future].live for future in pending):
+                    break
+                if grace_until is None:
+                    grace_until = min(deadline, now + SEARCH_FANOUT_LIVE_GRACE)
+                limit = grace_until
+            remaining = limit - now
+            if remaining <= 0:
+                break
+            done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    backend = backends[future]
+                    answered.append(backend.name)
+                    # Incomplete results are dropped before they can count towards the quorum
+                    valid = [r for r in future.result() if self._parse_search_result(r)]
+                    (live_results if backend.live else local_results).extend(merge_results([valid], seen))
+
+        # Slower backends are not waited for; cancelling skips any that have not started
+        for future in pending:
+            future.cancel()
+        merged = (live_results + local_results)[:max_results]
+        logger.info(f"Fan-out search: {len(merged)} results from {answered or 'no backends'}"
+                    f"{f', {len(pending)} not waited for' if pending else ''}")
+        return merged, bool(live_results)
+
+    async def _hedged_search(self, claim: str, max_results: int) -> List[Dict]:
+        """Live search within SEARCH_TIMEOUT, re-issued once if the first request runs past p95.
+
+        Each request takes its search limiter slot and token before it is sent,
+        so time queued behind other local searches counts towards neither the
+        deadline nor the latency samples; waiting longer than SEARCH_TIMEOUT
+        for the limiter raises LimiterTimeout. The hedge is sent only if a slot
+        and token are free at once. The first request to succeed wins. Executor
+        threads cannot be cancelled, so a losing or timed-out request finishes
+        in the background, bounded by the client's own timeout.
+        """
+        loop = asyncio.get_running_loop()
+        limiter = self.search_limiter
+        await limiter.acquire_async(SEARCH_TIMEOUT)
+        deadline = time.monotonic() + SEARCH_TIMEOUT
+
+        def timed_search():
+            try:
+                start = time.monotonic()
+                results = self._ddgs_text(claim, max_results)
+                self.search_latency.record(time.monotonic() - start)
+                return results
+            finally:
+                limiter.release()
+
+        pending = {loop.run_in_executor(self.io_executor, timed_search)}
+        if SEARCH_HEDGING:
+            hedge_delay = self.search_latency.percentile(SEARCH_HEDGE_PERCENTILE, SEARCH_HEDGE_DEFAULT_DELAY)
+            done, _ = await asyncio.wait(pending, timeout=min(hedge_delay, SEARCH_TIMEOUT))
+            if not done:
+                # A hedge that would queue locally only adds load where the limits already bind
+                if await limiter.try_acquire_async():
+                    self.search_hedges += 1
+                    logger.info(f"Search slower than {hedge_delay:.2f}s, sending hedged request")
+                    pending.add(loop.run_in_executor(self.io_executor, timed_search))
+                else:
+                    self.search_hedges_skipped += 1
+
+        error = None
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            done, pending = await asyncio.wait(pending, timeout=remaining,
+                                               return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+                error = future.exception()
+
+        if pending:
+            for future in pending:
+                # Keep abandoned requests from logging "exception never retrieved"
+                future.add_done_callback(lambda f: f.cancelled() or f.exception())
+            raise TimeoutError(f"search exceeded {SEARCH_TIMEOUT}s deadline")
+        raise error
+
+    def iter_search_claim(self, claim: str, max_results: int = MAX_SEARCH_RESULTS,
+                          use_cache: bool = True) -> Iterator[Source]:
+        """Search for the claim, yielding each validated source as soon as it is parsed.
+
+        Only duckduckgo_search releases before 5.0 hand results over one by one;
+        later ones build the full list first, so sources arrive together.
+        """
+        cache_key = f"{max_results}|{normalize_claim(claim)}"
+        cached = self._cached_sources(claim, cache_key, max_results) if use_cache else None
+        if cached is not None:
+            yield from cached
+            return
+
+        sources = []
+        if DUCKDUCKGO_AVAILABLE and self.search_breaker.allow():
+            try:
+                for result in self._ddgs_iter(claim, max_results):
+                    source = self._parse_search_result(result)
+                    if source:
+                        sources.append(source)
+                        yield source
             except Exception as e:
+                self.search_breaker.record_failure()
                 logger.warning(f"Real search failed: {e}")
+            else:
+                self.search_breaker.record_success()
+                # A stream cut short stays uncached, so the next search gets the full list
+                if sources:
+                    self._remember_sources(claim, cache_key, max_results, sources)
+
+        if not sources:
+            yield from self._local_index_sources(claim, max_results) or self._get_demo_sources(claim)
+
+    async def search_claim_stream(self, claim: str, max_results: int = MAX_SEARCH_RESULTS,
+                                  use_cache: bool = True) -> AsyncIterator[Source]:
+        """Async form of iter_search_claim; the blocking search runs on the I/O executor.
+
+        The stream ends by SEARCH_TIMEOUT: if live search has produced nothing
+        by then, the local fallback sources are yielded instead. Live requests
+        are not hedged, since a hedge cannot resume a partly consumed stream.
+        With SEARCH_FANOUT the merged fan-out results are yielded, as the
+        quorum wait means nothing could stream anyway.
+        """
+        if SEARCH_FANOUT:
+            for source in await self.search_claim_async(claim, max_results, use_cache):
+                yield source
+            return
+
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        done = object()
+        stopped = threading.Event()
+        deadline = time.monotonic() + SEARCH_TIMEOUT
+
+        def produce():
+            try:
+                for source in self.iter_search_claim(claim, max_results, use_cache):
+                    if stopped.is_set():
+                        break
+                    loop.call_soon_threadsafe(queue.put_nowait, source)
+            finally:
+                if not stopped.is_set():
+                    loop.call_soon_threadsafe(queue.put_nowait, done)
+
+        producer = loop.run_in_executor(self.io_executor, produce)
+        yielded = 0
+        try:
+            while True:
+                try:
+                    item = await asyncio.wait_for(queue.get(), max(0.0, deadline - time.monotonic()))
+                except asyncio.TimeoutError:
+                    stopped.set()
+                    self.search_breaker.record_failure()
+                    producer.add_done_callback(lambda f: f.cancelled() or f.exception())
+                    logger.warning(f"Streaming search exceeded {SEARCH_TIMEOUT}s after {yielded} sources")
+                    if not yielded:
+                        sources = await loop.run_in_executor(self.io_executor, self._local_index_sources,
+                                                             claim, max_results)
+                        for source in sources or self._get_demo_sources(claim):
+                            yield source
+                    return
+                if item is done:
+                    break
+                yielded += 1
+                yield item
+            await producer
+        finally:
+            # Consumer stopped early: let the producer thread finish on its own
+            stopped.set()
+
+    def _cached_sources(self, claim: str, cache_key: str, max_results: int) -> Optional[List[Source]]:
+        """Sources from the search cache or a near-duplicate claim, if any."""
+        if self.search_cache:
+            cached = self.search_cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"Search cache hit: {len(cached)} sources")
+                return [Source(**data) for data in cached]
+
+        if self.claim_index is not None:
+            match = self.claim_index.lookup(claim)
+            # Evidence gathered with a narrower search cannot stand in for a wider one
+            if match is not None and match[1][0] >= max_results:
+                similarity, (_, evidence) = match
+                logger.info(f"Reusing evidence of near-duplicate claim (similarity {similarity:.2f})")
+                return [Source(**data) for data in evidence[:max_results]]
+        return None
+
+    def _remember_sources(self, claim: str, cache_key: str, max_results: int, sources: List[Source]):
+        """Cache live search results; fallback results are not cached so outages are retried."""
+        evidence = [{"title": s.title, "snippet": s.snippet, "link": s.link} for s in sources]
+        if self.search_cache:
+            self.search_cache.put(cache_key, evidence)
+        if self.claim_index is not None:
+            self.claim_index.add(claim, (max_results, evidence))
+
+    def _ddgs_text(self, claim: str, max_results: int) -> List[Dict]:
+        """Run a blocking DuckDuckGo text search; the caller already holds a search limiter slot."""
+        return list(self.duckduckgo.iter_results(claim, max_results, throttle=False))
+
+    def _ddgs_iter(self, claim: str, max_results: int) -> Iterator[Dict]:
+        """Iterate DuckDuckGo text results as the client produces them."""
+        yield from self.duckduckgo.iter_results(claim, max_results)
+
+    def _parse_search_result(self, result: Dict) -> Optional[Source]:
+        """Convert one raw search result into a source, or None if incomplete."""
+        source = Source(
+            title=result.get("title", "")[:200],
+            snippet=result.get("body", "")[:500],
+            link=result.get("href", "")
+        )
         
-        # Fallback to demo data
-        return self._get_demo_sources(claim)
+        if source.title and source.snippet and source.link:
+            return source
+        return None
+
+    def _parse_search_results(self, search_results: List[Dict]) -> List[Source]:
+        """Convert raw search results into validated sources."""
+        sources = []
+        for result in search_results:
+            source = self._parse_search_result(result)
+            if source:
+                sources.append(source)
+        return sources
     
+    def _local_index_sources(self, claim: str, max_results: int) -> List[Source]:
+        """Sources from the offline BM25 index (empty if there is none or it fails)."""
+        if self.bm25 is None:
+            return []
+        try:
+            sources = self._parse_search_results(self.bm25.search(claim, max_results))
+        except Exception as e:
+            logger.warning(f"Local index search failed: {e}")
+            return []
+        if sources:
+            logger.info(f"Found {len(sources)} sources in the local index")
+        return sources
+
     def _get_demo_sources(self, claim: str) -> List[Source]:
         """Get demo sources for reliable testing with intelligent matching."""
-        claim_lower = claim.lower()
-        
-        # Enhanced keyword matching with scoring
-        best_match = None
-        best_score = 0
-        
-        for key, data in DEMO_SOURCES.items():
-            keywords = key.split()
-            
-            # Calculate match score based on keyword presence
-            score = 0
-            for keyword in keywords:
-                if keyword in claim_lower:
-                    score += 1
-                    
-            # Bonus for partial matches
-            for word in claim_lower.split():
-                if any(word in keyword for keyword in keywords):
-                    score += 0.5
-            
-            if score > best_score:
-                best_score = score
-                best_match = data
+        match = self.demo_index.best_match(claim)
         
         # Use best match if score is reasonable
-        if best_match and best_score >= 1:
+        if match:
+            best_match, best_score = match
             sources = []
             for source_data in best_match["sources"]:
                 sources.append(Source(
@@ -244,23 +907,119 @@ class FactCheckerPipeline:
 
     def classify_sources(self, claim: str, sources: List[Source]) -> List[Source]:
         """Classify sources using available methods."""
+        return _run_sync(self.classify_sources_async(claim, sources))
+
+    async def classify_sources_async(self, claim: str, sources: List[Source]) -> List[Source]:
+        """Classify sources using available methods without blocking the event loop."""
         
-        if self.use_gemini:
+        if self.use_gemini and self.classification_cascade:
+            return await self._classify_with_cascade_async(claim, sources)
+
+        if self.use_gemini and self.gemini_slo.allow():
             try:
-                return self._classify_with_gemini(claim, sources)
+                return await self._classify_with_gemini_async(claim, sources)
             except Exception as e:
                 logger.warning(f"Gemini classification failed: {e}")
         
         # Fallback to keyword analysis
         return self._classify_with_keywords(claim, sources)
+
+    async def _classify_with_cascade_async(self, claim: str, sources: List[Source]) -> List[Source]:
+        """Keyword classifier first; only sources it cannot label confidently go to Gemini."""
+        self._classify_with_keywords(claim, sources)
+        unclear = [s for s in sources if s.label == "unclear" or s.confidence < CASCADE_ACCEPT_CONFIDENCE]
+
+        # Rough token estimate (~4 characters per token) of the prompt that was not sent
+        full_tokens = len(self._build_classification_prompt(claim, sources)) // 4
+        sent_tokens = len(self._build_classification_prompt(claim, unclear)) // 4 if unclear else 0
+        with self.stats_lock:
+            self.cascade_counts["sources"] += len(sources)
+            self.cascade_counts["accepted_locally"] += len(sources) - len(unclear)
+            self.cascade_counts["llm_calls_avoided"] += 0 if unclear else 1
+            self.cascade_counts["tokens_avoided"] += full_tokens - sent_tokens
+
+        if unclear and self.gemini_slo.allow():
+            try:
+                await self._classify_with_gemini_async(claim, unclear)
+            except Exception as e:
+                # Unclear sources keep their keyword labels
+                logger.warning(f"Gemini classification failed: {e}")
+        logger.info(f"Cascade: {len(sources) - len(unclear)}/{len(sources)} sources labeled locally")
+        return sources
     
-    def _classify_with_gemini(self, claim: str, sources: List[Source]) -> List[Source]:
-        """Use Gemini for classification."""
+    async def _classify_with_gemini_async(self, claim: str, sources: List[Source]) -> List[Source]:
+        """Use Gemini for classification, micro-batched with other claims when enabled."""
+        if self.gemini_batcher:
+            return await self.gemini_batcher.submit((claim, sources))
+        return await self._classify_single_with_gemini_async(claim, sources)
+
+    async def _classify_single_with_gemini_async(self, claim: str, sources: List[Source]) -> List[Source]:
+        """Classify one claim's sources with a dedicated Gemini call."""
+        result = await self._gemini_generate_async(self._build_classification_prompt(claim, sources),
+                                                   json_mode=True, parse=self._parse_gemini_json)
+        return self._apply_classification_result(result, sources)
+
+    async def _classify_batch_with_gemini_async(self, jobs: List[Tuple[str, List[Source]]]) -> List:
+        """Classify several claims' sources in one Gemini call keyed per claim.
+
+        Claims missing from the response, or every claim if the response cannot
+        be parsed, fall back to single-claim calls.
+        """
+        async def single(claim: str, sources: List[Source]):
+            try:
+                return await self._classify_single_with_gemini_async(claim, sources)
+            except Exception as e:
+                return e
+
+        if len(jobs) == 1:
+            return [await single(*jobs[0])]
+
+        results: List = [None] * len(jobs)
+        try:
+            response = await self._gemini_generate_async(self._build_batch_prompt(jobs), json_mode=True,
+                                                         parse=self._parse_gemini_json)
+            for i, (claim, sources) in enumerate(jobs):
+                analysis = response.get(f"claim_{i+1}")
+                if isinstance(analysis, dict):
+                    results[i] = self._apply_classification_result(analysis, sources)
+        except Exception as e:
+            logger.warning(f"Batched Gemini classification failed, retrying per claim: {e}")
+
+        retry = [i for i, result in enumerate(results) if result is None]
+        for i, result in zip(retry, await asyncio.gather(*(single(*jobs[i]) for i in retry))):
+            results[i] = result
+        return results
+
+    def _build_batch_prompt(self, jobs: List[Tuple[str, List[Source]]]) -> str:
+        """Build one Gemini prompt covering several claims and their sources."""
+        claims_text = ""
+        for i, (claim, sources) in enumerate(jobs):
+            claims_text += f"CLAIM claim_{i+1}: \"{claim}\"\nSOURCES:\n"
+            for j, source in enumerate(sources):
+                claims_text += f"Source {j+1}:\nTitle: {source.title}\nContent: {source.snippet}\n\n"
+
+        return f"""
+Analyze each claim against its own sources:
+
+{claims_text}
+Respond with JSON keyed by claim, then by source:
+{{
+    "claim_1": {{
+        "source_1": {{"label": "SUPPORTS|REFUTES|UNCLEAR", "confidence": 0.0-1.0, "reasoning": "brief explanation"}}
+    }},
+    "claim_2": {{
+        "source_1": {{"label": "SUPPORTS|REFUTES|UNCLEAR", "confidence": 0.0-1.0, "reasoning": "brief explanation"}}
+    }}
+}}
+"""
+
+    def _build_classification_prompt(self, claim: str, sources: List[Source]) -> str:
+        """Build the Gemini classification prompt."""
         sources_text = ""
         for i, source in enumerate(sources):
             sources_text += f"Source {i+1}:\nTitle: {source.title}\nContent: {source.snippet}\n\n"
         
-        prompt = f"""
+        return f"""
 Analyze this claim against the sources:
 
 CLAIM: "{claim}"
@@ -275,9 +1034,8 @@ For each source, respond with JSON:
 }}
 """
 
-        response = self.gemini_model.generate_content(prompt)
-        result = json.loads(response.text.strip())
-        
+    def _apply_classification_result(self, result: Dict, sources: List[Source]) -> List[Source]:
+        """Apply a parsed {"source_N": analysis} mapping to the sources."""
         for i, source in enumerate(sources):
             source_key = f"source_{i+1}"
             if source_key in result:
@@ -289,97 +1047,102 @@ For each source, respond with JSON:
                 source.label = "unclear"
                 source.confidence = 0.5
                 source.reasoning = "No analysis provided"
+            source.classifier = "gemini"
                 
         return sources
 
     def _classify_with_keywords(self, claim: str, sources: List[Source]) -> List[Source]:
         """Enhanced keyword classification with domain-specific logic."""
         
-        claim_lower = claim.lower()
-        
-        # Domain-specific keyword sets
-        scientific_keywords = {
-            "support": ["scientific", "established", "confirmed", "proven", "research shows", "studies indicate", 
-                       "fact", "accurate", "correct", "well-documented", "consensus", "evidence", "fundamental"],
-            "refute": ["false", "incorrect", "wrong", "myth", "debunked", "not true", "misconception", 
-                      "urban legend", "fraudulent", "retracted", "disproven", "not 48", "46 chromosomes", "different from"]
-        }
-        
-        medical_keywords = {
-            "support": ["medical consensus", "clinical studies", "peer-reviewed", "scientific evidence", 
-                       "health organizations", "medical community", "research confirms", "safe", "approved"],
-            "refute": ["no link", "no connection", "debunked", "myth", "false claim", "not supported by evidence",
-                      "fraudulent study", "retracted", "disproven", "do not cause"]
-        }
-        
-        astronomy_keywords = {
-            "support": ["nasa confirms", "astronomical", "solar system", "planet", "largest", "scientific fact"],
-            "refute": ["not visible", "myth", "false", "cannot be seen", "debunked", "incorrect"]
-        }
+        # One snapshot per call so a concurrent hot reload cannot mix lexicon versions
+        matcher = self.lexicon.current()
         
         # Select appropriate keyword set based on claim content
-        if any(word in claim_lower for word in ["vaccine", "autism", "medical", "health"]):
-            keywords = medical_keywords
-        elif any(word in claim_lower for word in ["planet", "jupiter", "solar system", "space", "nasa"]):
-            keywords = astronomy_keywords
-        elif any(word in claim_lower for word in ["chromosome", "genetic", "dna", "biology"]):
-            keywords = scientific_keywords
-        elif any(word in claim_lower for word in ["temperature", "boils", "celsius", "physics", "chemistry"]):
-            keywords = scientific_keywords
-        else:
-            keywords = scientific_keywords  # Default to scientific
-        
-        support_keywords = keywords["support"]
-        refute_keywords = keywords["refute"]
+        domain = matcher.route(claim.lower())
         
         for source in sources:
-            snippet_lower = source.snippet.lower()
-            title_lower = source.title.lower()
-            
-            # Advanced scoring with phrase matching
-            title_support_score = 0
-            title_refute_score = 0
-            snippet_support_score = 0
-            snippet_refute_score = 0
-            
-            # Check for support keywords/phrases
-            for keyword in support_keywords:
-                if keyword in title_lower:
-                    title_support_score += 3  # Title matches weighted higher
-                if keyword in snippet_lower:
-                    snippet_support_score += 1
-            
-            # Check for refute keywords/phrases
-            for keyword in refute_keywords:
-                if keyword in title_lower:
-                    title_refute_score += 3
-                if keyword in snippet_lower:
-                    snippet_refute_score += 1
+            # Title matches weighted higher
+            title_support, title_refute = matcher.score(domain, source.title.lower())
+            snippet_support, snippet_refute = matcher.score(domain, source.snippet.lower())
             
-            total_support = title_support_score + snippet_support_score
-            total_refute = title_refute_score + snippet_refute_score
-            
-            # Enhanced decision logic
-            if total_support > total_refute and total_support >= 2:
+            total_support = title_support * 3 + snippet_support
+            total_refute = title_refute * 3 + snippet_refute
+            self._label_from_scores(source, total_support, total_refute)
+                
+        return sources
+
+    def classify_batch_with_keywords(self, batch: List[Tuple[str, List[Source]]]) -> List[List[Source]]:
+        """Keyword-classify many claims' sources at once with NumPy array operations.
+
+        Produces the same labels and confidences as _classify_with_keywords; falls
+        back to it per claim when NumPy is not installed.
+        """
+        if not NUMPY_AVAILABLE:
+            return [self._classify_with_keywords(claim, sources) for claim, sources in batch]
+
+        matcher = self.lexicon.current()
+        flat_sources: List[Source] = []
+        domains: List[str] = []
+        for claim, sources in batch:
+            domain = matcher.route(claim.lower())
+            flat_sources.extend(sources)
+            domains.extend([domain] * len(sources))
+        if not flat_sources:
+            return [sources for _, sources in batch]
+
+        title_support, title_refute = matcher.score_many(domains, [s.title.lower() for s in flat_sources])
+        snippet_support, snippet_refute = matcher.score_many(domains, [s.snippet.lower() for s in flat_sources])
+        total_support = title_support * 3 + snippet_support
+        total_refute = title_refute * 3 + snippet_refute
+
+        supports = (total_support > total_refute) & (total_support >= 2)
+        refutes = (total_refute > total_support) & (total_refute >= 2)
+        mixed = ~supports & ~refutes & (total_support == total_refute) & (total_support > 0)
+        confidence = np.where(supports, np.minimum(0.90, 0.65 + (total_support * 0.05)),
+                     np.where(refutes, np.minimum(0.90, 0.65 + (total_refute * 0.05)),
+                     np.where(mixed, 0.6, 0.5)))
+
+        for i, source in enumerate(flat_sources):
+            source.confidence = float(confidence[i])
+            source.classifier = "keywords"
+            if supports[i]:
                 source.label = "supports"
-                confidence = min(0.90, 0.65 + (total_support * 0.05))
-                source.confidence = confidence
-                source.reasoning = f"Strong support indicators: {total_support} points"
-            elif total_refute > total_support and total_refute >= 2:
+                source.reasoning = f"Strong support indicators: {int(total_support[i])} points"
+            elif refutes[i]:
                 source.label = "refutes"
-                confidence = min(0.90, 0.65 + (total_refute * 0.05))
-                source.confidence = confidence
-                source.reasoning = f"Strong refute indicators: {total_refute} points"
-            elif total_support == total_refute and total_support > 0:
+                source.reasoning = f"Strong refute indicators: {int(total_refute[i])} points"
+            elif mixed[i]:
                 source.label = "unclear"
-                source.confidence = 0.6
-                source.reasoning = f"Mixed signals: {total_support} support, {total_refute} refute"
+                source.reasoning = f"Mixed signals: {int(total_support[i])} support, {int(total_refute[i])} refute"
             else:
                 source.label = "unclear"
-                source.confidence = 0.5
                 source.reasoning = "Insufficient clear indicators found"
-                
-        return sources
+
+        return [sources for _, sources in batch]
+
+    def _label_from_scores(self, source: Source, total_support: int, total_refute: int):
+        """Label a source from its weighted support/refute keyword scores."""
+        source.classifier = "keywords"
+        
+        # Enhanced decision logic
+        if total_support > total_refute and total_support >= 2:
+            source.label = "supports"
+            confidence = min(0.90, 0.65 + (total_support * 0.05))
+            source.confidence = confidence
+            source.reasoning = f"Strong support indicators: {total_support} points"
+        elif total_refute > total_support and total_refute >= 2:
+            source.label = "refutes"
+            confidence = min(0.90, 0.65 + (total_refute * 0.05))
+            source.confidence = confidence
+            source.reasoning = f"Strong refute indicators: {total_refute} points"
+        elif total_support == total_refute and total_support > 0:
+            source.label = "unclear"
+            source.confidence = 0.6
+            source.reasoning = f"Mixed signals: {total_support} support, {total_refute} refute"
+        else:
+            source.label = "unclear"
+            source.confidence = 0.5
+            source.reasoning = "Insufficient clear indicators found"
 
     def aggregate_verdict(self, sources: List[Source]) -> Tuple[str, float, str]:
         """Aggregate source classifications into final verdict."""
@@ -391,24 +1154,21 @@ For each source, respond with JSON:
         unclear_count = len([s for s in sources if s.label == "unclear"])
         
         total_sources = len(sources)
+        verdict = verdict_bucket(support_count, refute_count)
         
-        if support_count >= 2 and refute_count == 0:
-            verdict = "True"
+        if verdict == "True":
             confidence = min(0.95, 0.7 + (support_count / total_sources) * 0.2)
             reasoning = f"Strong support: {support_count}/{total_sources} sources support"
             
-        elif refute_count >= 2 and support_count == 0:
-            verdict = "False"
+        elif verdict == "False":
             confidence = min(0.95, 0.7 + (refute_count / total_sources) * 0.2)
             reasoning = f"Strong refutation: {refute_count}/{total_sources} sources refute"
             
-        elif support_count >= 1 and refute_count >= 1:
-            verdict = "Misleading"
+        elif verdict == "Misleading":
             confidence = 0.6 + abs(support_count - refute_count) / total_sources * 0.2
             reasoning = f"Mixed evidence: {support_count} support, {refute_count} refute"
             
         else:
-            verdict = "Unverified"
             avg_confidence = sum(s.confidence for s in sources) / total_sources
             confidence = max(0.3, avg_confidence)
             reasoning = f"Insufficient clear evidence: {unclear_count}/{total_sources} unclear"
@@ -418,18 +1178,87 @@ For each source, respond with JSON:
     def generate_social_post(self, claim: str, verdict: str, confidence: float, 
                            reasoning: str, sources: List[Source]) -> str:
         """Generate social media post."""
+        return _run_sync(self.generate_social_post_async(claim, verdict, confidence, reasoning, sources))
+
+    async def generate_social_post_async(self, claim: str, verdict: str, confidence: float,
+                                         reasoning: str, sources: List[Source]) -> str:
+        """Generate social media post without blocking the event loop."""
         
-        if self.use_gemini:
+        if self.use_gemini and self.gemini_slo.allow():
             try:
-                return self._generate_with_gemini(claim, verdict, confidence, sources)
+                return await self._generate_with_gemini_async(claim, verdict, confidence, sources)
             except Exception as e:
                 logger.warning(f"Gemini post generation failed: {e}")
         
         return self._generate_with_template(claim, verdict, confidence, reasoning, sources)
 
-    def _generate_with_gemini(self, claim: str, verdict: str, confidence: float, sources: List[Source]) -> str:
-        """Generate post using Gemini."""
-        prompt = f"""
+    async def _generate_with_gemini_async(self, claim: str, verdict: str, confidence: float,
+                                          sources: List[Source]) -> str:
+        """Generate post using the async Gemini client."""
+        response_text = await self._gemini_generate_async(self._build_post_prompt(claim, verdict, confidence))
+        return self._finalize_gemini_post(response_text)
+
+    async def _classify_and_draft_async(self, claim: str,
+                                        sources: List[Source]) -> Tuple[List[Source], Optional[Dict[str, str]]]:
+        """One Gemini round trip returning source labels plus a draft post per verdict.
+
+        Falls back to regular classification (and no drafts) if the call fails
+        or the labels are malformed, and to no drafts if only the posts are.
+        """
+        try:
+            result = await self._gemini_generate_async(self._build_fused_prompt(claim, sources), json_mode=True,
+                                                       parse=self._parse_gemini_json)
+            if not isinstance(result.get("sources"), dict):
+                raise ValueError("fused reply has no sources mapping")
+            self._apply_classification_result(result["sources"], sources)
+            # Malformed drafts do not spoil the labels; the post is then generated on its own
+            posts = result.get("posts")
+            if not isinstance(posts, dict):
+                logger.warning("Fused Gemini reply has no usable drafts")
+                return sources, None
+            return sources, {verdict: str(post) for verdict, post in posts.items() if post}
+        except Exception as e:
+            logger.warning(f"Fused Gemini call failed: {e}")
+            return await self.classify_sources_async(claim, sources), None
+
+    def _build_fused_prompt(self, claim: str, sources: List[Source]) -> str:
+        """Build the Gemini prompt for classification plus per-verdict post drafts."""
+        sources_text = ""
+        for i, source in enumerate(sources):
+            sources_text += f"Source {i+1}:\nTitle: {source.title}\nContent: {source.snippet}\n\n"
+
+        return f"""
+Analyze this claim against the sources, then draft a social media fact-check post
+for each possible verdict:
+
+CLAIM: "{claim}"
+
+SOURCES:
+{sources_text}
+
+Post requirements:
+- Maximum 580 characters
+- Include the verdict and the literal placeholder {{confidence}} for the confidence
+- Professional tone
+- Include hashtags
+
+Respond with JSON:
+{{
+    "sources": {{
+        "source_1": {{"label": "SUPPORTS|REFUTES|UNCLEAR", "confidence": 0.0-1.0, "reasoning": "brief explanation"}}
+    }},
+    "posts": {{
+        "True": "post text",
+        "False": "post text",
+        "Misleading": "post text",
+        "Unverified": "post text"
+    }}
+}}
+"""
+
+    def _build_post_prompt(self, claim: str, verdict: str, confidence: float) -> str:
+        """Build the Gemini social post prompt."""
+        return f"""
 Create a social media fact-check post:
 
 CLAIM: "{claim}"
@@ -445,8 +1274,9 @@ Requirements:
 Generate only the post content.
 """
 
-        response = self.gemini_model.generate_content(prompt)
-        post = response.text.strip()
+    def _finalize_gemini_post(self, response_text: str) -> str:
+        """Append hashtags and trim a Gemini-generated post."""
+        post = response_text.strip()
         
         if len(post + "\n\n#FactCheck #AI") <= 600:
             post += "\n\n#FactCheck #AI"
@@ -480,15 +1310,303 @@ Generate only the post content.
         
         return post[:600]
 
-    def process_claim(self, claim: str) -> FactCheckResult:
-        """Complete fact-checking pipeline."""
+    def process_claim(self, claim: str, use_cache: bool = True, stream: bool = STREAMING_PIPELINE,
+                      full_classification: bool = False, adaptive: bool = ADAPTIVE_SEARCH,
+                      deadline: Optional[float] = None) -> FactCheckResult:
+        """Complete fact-checking pipeline; deadline is the number of seconds the caller can wait."""
+        return _run_sync(self.process_claim_async(claim, use_cache, stream, full_classification, adaptive,
+                                                  deadline))
+
+    async def process_claim_async(self, claim: str, use_cache: bool = True, stream: bool = STREAMING_PIPELINE,
+                                  full_classification: bool = False, adaptive: bool = ADAPTIVE_SEARCH,
+                                  deadline: Optional[float] = None) -> FactCheckResult:
+        """Complete fact-checking pipeline; many claims can share one event loop.
+
+        With a deadline, each stage gets the remaining budget: Gemini and extra
+        sources are skipped when time is short, and a best-effort result
+        (flagged partial) is returned before the deadline.
+        """
+        start_time = time.time()
+        options = ClaimOptions(stream=stream, full_classification=full_classification, adaptive=adaptive,
+                               deadline=Deadline(deadline) if deadline is not None else None)
+        cache_key = normalize_claim(claim)
+
+        # Audit runs always recompute so every source is classified
+        if use_cache and self.result_cache and not full_classification:
+            cached, stale = self.result_cache.get(cache_key)
+            if cached is not None:
+                if stale:
+                    self._schedule_refresh(claim, cache_key, options)
+                logger.info(f"Result cache hit ({'stale' if stale else 'fresh'}): {cached.verdict}")
+                return replace(cached, claim=claim, cached=True, stale=stale,
+                               processing_time=time.time() - start_time)
+
+        return await self._process_claim_coalesced(claim, cache_key, options)
+
+    async def _process_claim_coalesced(self, claim: str, cache_key: str, options: ClaimOptions) -> FactCheckResult:
+        """Process a claim, joining an identical in-flight computation if there is one."""
+
+        async def compute() -> FactCheckResult:
+            result = await self._process_claim_uncached(claim, options)
+            # Results cut short by a deadline are not good enough to serve to later callers
+            if self.result_cache and result.verdict != "Error" and not result.partial:
+                self.result_cache.put(cache_key, result)
+            return result
+
+        # Another caller's longer (or missing) deadline must not hold this one up
+        if options.deadline is not None:
+            return await compute()
+
+        flight_key = f"{cache_key}|full" if options.full_classification else cache_key
+        result = await self.single_flight.do(flight_key, compute)
+        return replace(result, claim=claim) if result.claim != claim else result
+
+    def _schedule_refresh(self, claim: str, cache_key: str, options: ClaimOptions):
+        """Recompute a stale cached result in the background, once per key."""
+        with self.refresh_lock:
+            if cache_key in self.refreshing:
+                return
+            self.refreshing.add(cache_key)
+        self.refresh_executor.submit(self._refresh_result, claim, cache_key, replace(options, deadline=None))
+
+    def _refresh_result(self, claim: str, cache_key: str, options: ClaimOptions):
+        try:
+            _run_sync(self._process_claim_coalesced(claim, cache_key, options))
+        finally:
+            with self.refresh_lock:
+                self.refreshing.discard(cache_key)
+
+    async def classify_sources_incremental_async(self, claim: str, sources: List[Source],
+                                                 full_classification: bool = False,
+                                                 prior: Optional[List[Source]] = None) -> List[Source]:
+        """Classify sources chunk by chunk, stopping once the verdict bucket is settled.
+
+        Returns the classified sources in their original order; sources skipped
+        after an early exit are left out. prior holds already classified sources
+        that count toward the verdict. full_classification disables the exit.
+        """
+        chunks = [sources[i:i + CLASSIFY_CHUNK_SIZE] for i in range(0, len(sources), CLASSIFY_CHUNK_SIZE)]
+        tracker = IncrementalVerdict(len(sources) + len(prior or []))
+        tracker.add(prior or [])
+        classified = set()
+        pending = set()
+        next_chunk = 0
+
+        while next_chunk < len(chunks) or pending:
+            while next_chunk < len(chunks) and len(pending) < EARLY_EXIT_PARALLEL_CHUNKS:
+                pending.add(asyncio.create_task(self.classify_sources_async(claim, chunks[next_chunk])))
+                next_chunk += 1
+
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                chunk = task.result()
+                classified.update(id(source) for source in chunk)
+                tracker.add(chunk)
+
+            if not full_classification and tracker.settled() and (pending or next_chunk < len(chunks)):
+                for task in pending:
+                    task.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+                logger.info(f"Verdict settled early: skipped {len(sources) - len(classified)} sources")
+                break
+
+        return [source for source in sources if id(source) in classified]
+
+    async def _classify_stage(self, claim: str, sources: List[Source], full_classification: bool,
+                              prior: Optional[List[Source]] = None,
+                              deadline: Optional[Deadline] = None) -> List[Source]:
+        """Classification step of the pipeline, with early exit when enabled.
+
+        Under a deadline, Gemini is skipped when too little time remains, and a
+        classification that runs into the deadline is redone with keywords.
+        """
+        if self.use_gemini and not self._has_llm_budget(deadline):
+            return self._classify_with_keywords(claim, sources)
+        if EARLY_EXIT_ENABLED:
+            classify = self.classify_sources_incremental_async(claim, sources, full_classification, prior)
+        else:
+            classify = self.classify_sources_async(claim, sources)
+        try:
+            return await asyncio.wait_for(classify, _budget(deadline))
+        except asyncio.TimeoutError:
+            if deadline is None:
+                raise
+            deadline.cut_short = True
+            logger.warning("Classification ran into the deadline, labeling with keywords")
+            return self._classify_with_keywords(claim, sources)
+
+    def _has_llm_budget(self, deadline: Optional[Deadline]) -> bool:
+        """Whether a Gemini call still fits before the deadline (always true without one)."""
+        return deadline is None or deadline.allows(DEADLINE_MIN_LLM_BUDGET)
+
+    async def _search_stage(self, claim: str, deadline: Optional[Deadline],
+                            max_results: int = MAX_SEARCH_RESULTS) -> Tuple[List[Source], bool]:
+        """Search step of the pipeline; falls back to demo sources if it runs into the deadline."""
+        try:
+            return await asyncio.wait_for(self._search_with_origin(claim, max_results), _budget(deadline))
+        except asyncio.TimeoutError:
+            if deadline is None:
+                raise
+            deadline.cut_short = True
+            logger.warning("Search ran into the deadline, using fallback sources")
+            return self._get_demo_sources(claim), True
+
+    async def _fused_stage(self, claim: str, sources: List[Source],
+                           deadline: Optional[Deadline]) -> Tuple[List[Source], Optional[Dict[str, str]]]:
+        """Fused classification and drafting, redone with keywords if it runs into the deadline."""
+        try:
+            return await asyncio.wait_for(self._classify_and_draft_async(claim, sources), _budget(deadline))
+        except asyncio.TimeoutError:
+            if deadline is None:
+                raise
+            deadline.cut_short = True
+            logger.warning("Fused Gemini call ran into the deadline, labeling with keywords")
+            return self._classify_with_keywords(claim, sources), None
+
+    async def _post_stage(self, claim: str, verdict: str, confidence: float, reasoning: str,
+                          sources: List[Source], deadline: Optional[Deadline]) -> str:
+        """Post generation step; uses the template when Gemini would not finish before the deadline."""
+        if self.use_gemini and not self._has_llm_budget(deadline):
+            return self._generate_with_template(claim, verdict, confidence, reasoning, sources)
+        try:
+            return await asyncio.wait_for(
+                self.generate_social_post_async(claim, verdict, confidence, reasoning, sources), _budget(deadline))
+        except asyncio.TimeoutError:
+            if deadline is None:
+                raise
+            deadline.cut_short = True
+            logger.warning("Post generation ran into the deadline, using the template")
+            return self._generate_with_template(claim, verdict, confidence, reasoning, sources)
+
+    async def _gather_evidence_adaptively(self, claim: str, full_classification: bool = False,
+                                          deadline: Optional[Deadline] = None) -> List[Source]:
+        """Fetch and classify more results only while the verdict is uncertain.
+
+        Starts with a small first page and widens the search while the verdict is
+        Unverified/Misleading or below CONFIDENCE_THRESHOLD, bounded by
+        ADAPTIVE_MAX_SOURCES sources and ADAPTIVE_MAX_ROUNDS search round trips.
+        """
+        classified: List[Source] = []
+        seen_links = set()
+        requested = min(ADAPTIVE_INITIAL_RESULTS, ADAPTIVE_MAX_SOURCES)
+
+        for round_number in range(1, ADAPTIVE_MAX_ROUNDS + 1):
+            # The search API has no offset, so a wider request returns the earlier results too
+            sources, is_fallback = await self._search_stage(claim, deadline, requested)
+            new_sources = [s for s in sources if s.link not in seen_links][:ADAPTIVE_MAX_SOURCES - len(classified)]
+            seen_links.update(s.link for s in new_sources)
+            if new_sources:
+                classified.extend(await self._classify_stage(claim, new_sources, full_classification, classified,
+                                                             deadline))
+
+            verdict, confidence, _ = self.aggregate_verdict(classified)
+            uncertain = verdict in ("Unverified", "Misleading") or confidence < CONFIDENCE_THRESHOLD
+            if not uncertain or is_fallback or not new_sources or len(classified) >= ADAPTIVE_MAX_SOURCES:
+                break
+            if deadline is not None and not deadline.allows(DEADLINE_MIN_SEARCH_BUDGET):
+                logger.info(f"Deadline close after round {round_number}: not fetching more sources")
+                break
+            requested = min(requested + ADAPTIVE_PAGE_SIZE, ADAPTIVE_MAX_SOURCES)
+            logger.info(f"Verdict uncertain ({verdict}, {confidence:.0%}) after round {round_number}: "
+                        f"requesting {requested} results")
+
+        return classified
+
+    async def _search_and_classify_streaming(self, claim: str, full_classification: bool = False,
+                                             chunk_size: int = CLASSIFY_CHUNK_SIZE,
+                                             deadline: Optional[Deadline] = None) -> List[Source]:
+        """Classify sources in chunks while the search is still returning results.
+
+        With EARLY_EXIT_ENABLED, the search and pending chunks are abandoned
+        once the verdict is settled. Under a deadline the search stops at the
+        deadline and each chunk is classified within the remaining budget.
+        """
+        start_time = time.time()
+        early_exit = EARLY_EXIT_ENABLED and not full_classification
+        tracker = IncrementalVerdict(MAX_SEARCH_RESULTS)
+        sources: List[Source] = []
+        chunk: List[Source] = []
+        tasks = []
+        labeled = []
+
+        def on_labeled(task):
+            if task.cancelled() or task.exception():
+                return
+            tracker.add(task.result())
+            if not labeled:
+                labeled.append(task)
+                logger.info(f"First sources labeled after {time.time() - start_time:.2f}s")
+
+        def dispatch(batch: List[Source]):
+            if deadline is not None:
+                classify = self._classify_stage(claim, batch, True, deadline=deadline)
+            else:
+                classify = self.classify_sources_async(claim, batch)
+            tasks.append(asyncio.create_task(classify))
+            tasks[-1].add_done_callback(on_labeled)
+
+        stopped_early = False
+        stream = self.search_claim_stream(claim)
+        try:
+            while True:
+                try:
+                    source = await asyncio.wait_for(stream.__anext__(), _budget(deadline))
+                except StopAsyncIteration:
+                    break
+                except asyncio.TimeoutError:
+                    if deadline is None:
+                        raise
+                    deadline.cut_short = True
+                    logger.warning(f"Search ran into the deadline after {len(sources)} sources")
+                    break
+                if early_exit and tracker.settled():
+                    stopped_early = True
+                    break
+                sources.append(source)
+                chunk.append(source)
+                if len(chunk) >= chunk_size:
+                    dispatch(chunk)
+                    chunk = []
+        finally:
+            await stream.aclose()
+        if chunk:
+            dispatch(chunk)
+
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                task.result()
+            if pending and early_exit and tracker.settled():
+                for task in pending:
+                    task.cancel()
+                # Cancellation only takes effect once the tasks run again
+                await asyncio.gather(*pending, return_exceptions=True)
+                stopped_early = True
+                break
+
+        classified = [source for task in tasks if not task.cancelled() and not task.exception()
+                      for source in task.result()]
+        if stopped_early:
+            logger.info(f"Verdict settled early after {len(classified)} classified sources")
+        return classified
+
+    async def _process_claim_uncached(self, claim: str, options: ClaimOptions) -> FactCheckResult:
+        """Run search, classification, aggregation and post generation for a claim."""
         start_time = time.time()
         
         try:
             logger.info(f"Processing claim: {claim}")
             
-            # Step 1: Search
-            sources = self.search_claim(claim)
+            # Step 1: Search (streaming mode also classifies as results arrive)
+            deadline = options.deadline
+            if options.stream:
+                sources = await self._search_and_classify_streaming(claim, options.full_classification,
+                                                                    deadline=deadline)
+            elif options.adaptive:
+                sources = await self._gather_evidence_adaptively(claim, options.full_classification, deadline)
+            else:
+                sources, _ = await self._search_stage(claim, deadline)
             
             if not sources:
                 return FactCheckResult(
@@ -498,17 +1616,30 @@ Generate only the post content.
                     confidence=0.0,
                     reasoning="No sources could be retrieved",
                     social_post=f"❌ Unable to fact-check: \"{claim}\" - No sources available. #FactCheck",
-                    processing_time=time.time() - start_time
+                    processing_time=time.time() - start_time,
+                    partial=deadline is not None and deadline.cut_short
                 )
             
-            # Step 2: Classify
-            classified_sources = self.classify_sources(claim, sources)
+            # Step 2: Classify (fused mode also drafts a post for every possible verdict)
+            drafts = None
+            if options.stream or options.adaptive:
+                classified_sources = sources
+            elif (self.use_gemini and GEMINI_FUSED_MODE and self._has_llm_budget(deadline)
+                  and self.gemini_slo.allow()):
+                classified_sources, drafts = await self._fused_stage(claim, sources, deadline)
+            else:
+                classified_sources = await self._classify_stage(claim, sources, options.full_classification,
+                                                                deadline=deadline)
             
-            # Step 3: Aggregate
+            # Step 3: Aggregate (always local, even when Gemini drafted the posts)
             verdict, confidence, reasoning = self.aggregate_verdict(classified_sources)
             
             # Step 4: Generate post
-            social_post = self.generate_social_post(claim, verdict, confidence, reasoning, classified_sources)
+            if drafts and drafts.get(verdict):
+                social_post = self._finalize_gemini_post(drafts[verdict].replace("{confidence}", f"{confidence:.0%}"))
+            else:
+                social_post = await self._post_stage(claim, verdict, confidence, reasoning, classified_sources,
+                                                     deadline)
             
             processing_time = time.time() - start_time
             
@@ -519,7 +1650,9 @@ Generate only the post content.
                 confidence=confidence,
                 reasoning=reasoning,
                 social_post=social_post,
-                processing_time=processing_time
+                processing_time=processing_time,
+                classifier=classifier_summary(classified_sources),
+                partial=deadline is not None and deadline.cut_short
             )
             
             logger.info(f"Completed: {verdict} ({confidence:.0%}) in {processing_time:.2f}s")
@@ -527,15 +1660,58 @@ Generate only the post content.
             
         except Exception as e:
             logger.error(f"Pipeline failed: {e}")
-            return FactCheckResult(
-                claim=claim,
-                sources=[],
-                verdict="Error",
-                confidence=0.0,
-                reasoning=f"Processing error: {str(e)}",
-                social_post=f"❌ Error processing: \"{claim}\" #FactCheck",
-                processing_time=time.time() - start_time
-            )
+            return self._error_result(claim, e, start_time)
+
+    def _error_result(self, claim: str, error: Exception, start_time: float) -> FactCheckResult:
+        """Build the result returned when processing a claim fails."""
+        return FactCheckResult(
+            claim=claim,
+            sources=[],
+            verdict="Error",
+            confidence=0.0,
+            reasoning=f"Processing error: {str(error)}",
+            social_post=f"❌ Error processing: \"{claim}\" #FactCheck",
+            processing_time=time.time() - start_time
+        )
+
+    def process_claims(self, claims: List[str],
+                       max_concurrency: int = BATCH_MAX_CONCURRENCY) -> List[FactCheckResult]:
+        """Fact-check a batch of claims concurrently, preserving input order."""
+        return _run_sync(self.process_claims_async(claims, max_concurrency))
+
+    async def process_claims_async(self, claims: List[str],
+                                   max_concurrency: int = BATCH_MAX_CONCURRENCY) -> List[FactCheckResult]:
+        """Fact-check a batch of claims on one event loop with bounded concurrency."""
+        start_time = time.time()
+        max_in_flight = max(1, min(max_concurrency, len(claims)))
+        semaphore = asyncio.Semaphore(max_in_flight)
+
+        async def run_one(claim: str) -> FactCheckResult:
+            async with semaphore:
+                return await self.process_claim_async(claim)
+
+        outcomes = await asyncio.gather(*(run_one(claim) for claim in claims), return_exceptions=True)
+
+        results: List[FactCheckResult] = []
+        for i, outcome in enumerate(outcomes):
+            # A claim cancelled from inside (not the batch itself) is reported, not raised
+            if isinstance(outcome, BaseException):
+                logger.error(f"Pipeline failed for batch item {i}: {outcome or type(outcome).__name__}")
+                outcome = self._error_result(claims[i], outcome, start_time)
+            results.append(outcome)
+
+        elapsed = time.time() - start_time
+        errors = len([r for r in results if r.verdict == "Error"])
+        self.last_batch_stats = {
+            "claims": len(claims),
+            "errors": errors,
+            "max_concurrency": max_in_flight,
+            "elapsed": elapsed,
+            "claims_per_second": len(claims) / elapsed if elapsed > 0 else 0.0
+        }
+        logger.info(f"Batch completed: {len(claims)} claims ({errors} errors) in {elapsed:.2f}s "
+                    f"({self.last_batch_stats['claims_per_second']:.2f} claims/s, concurrency {max_in_flight})")
+        return results
 
 # For backward compatibility
 FactCheckerPipeline = FactCheckerPipeline
@@ -0,0 +1,294 @@
+"""
+Compiled multi-pattern keyword matching for the local classifier
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from collections import deque
+from typing import Dict, List, Optional, Set, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the snapshot layout of CompiledLexicon changes
+SNAPSHOT_FORMAT = 2
+
+
+class AhoCorasick:
+    """Aho-Corasick automaton reporting every pattern that occurs in a text in one pass."""
+
+    def __init__(self, patterns: List[str]):
+        self.patterns = list(patterns)
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.output: List[Tuple[int, ...]] = [()]
+
+        for pattern_id, pattern in enumerate(self.patterns):
+            state = 0
+            for ch in pattern:
+                next_state = self.goto[state].get(ch)
+                if next_state is None:
+                    next_state = len(self.goto)
+                    self.goto[state][ch] = next_state
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append(())
+                state = next_state
+            self.output[state] = self.output[state] + (pattern_id,)
+
+        # Breadth-first pass sets failure links and merges outputs along them
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and ch not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(ch, 0)
+                self.fail[next_state] = target if target != next_state else 0
+                if self.output[self.fail[next_state]]:
+                    self.output[next_state] = self.output[next_state] + self.output[self.fail[next_state]]
+
+    @classmethod
+    def from_tables(cls, patterns: List[str], goto: List[Dict[str, int]], fail: List[int],
+                    output: List[List[int]]) -> "AhoCorasick":
+        """Rebuild an automaton from the tables of a previously compiled one."""
+        automaton = cls.__new__(cls)
+        automaton.patterns = patterns
+        automaton.goto = goto
+        automaton.fail = fail
+        automaton.output = [tuple(ids) for ids in output]
+        return automaton
+
+    def find(self, text: str) -> Set[int]:
+        """Ids of the distinct patterns occurring anywhere in the text."""
+        goto, fail, output = self.goto, self.fail, self.output
+        matched: Set[int] = set()
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if output[state]:
+                matched.update(output[state])
+        return matched
+
+
+class CompiledLexicon:
+    """Support/refute lexicons and domain routing compiled into a single automaton.
+
+    Every domain keyword and routing trigger is one pattern; per-pattern tables
+    give its routing priority and its support/refute weight in each domain, so
+    routing and scoring each take one linear pass over the text.
+    """
+
+    # Plain-data attributes saved in snapshots (the automaton is stored as its tables)
+    SNAPSHOT_FIELDS = ("version", "default_domain", "domain_names", "route_domains", "route_priority",
+                       "support_weights", "refute_weights")
+
+    def __init__(self, lexicon: Dict):
+        self.version = lexicon.get("version", 0)
+        domains = lexicon["domains"]
+        routes = lexicon["routes"]
+        self.default_domain = lexicon["default_domain"]
+        self.domain_names = list(domains)
+
+        pattern_ids: Dict[str, int] = {}
+
+        def pattern_id(pattern: str) -> int:
+            if pattern not in pattern_ids:
+                pattern_ids[pattern] = len(pattern_ids)
+            return pattern_ids[pattern]
+
+        route_triggers = [[pattern_id(trigger) for trigger in route["triggers"]] for route in routes]
+        domain_keywords = {
+            name: ([pattern_id(k) for k in keywords["support"]], [pattern_id(k) for k in keywords["refute"]])
+            for name, keywords in domains.items()
+        }
+
+        self.automaton = AhoCorasick(list(pattern_ids))
+        size = len(pattern_ids)
+
+        # Earliest route each trigger belongs to (routes are checked in order)
+        self.route_domains = [route["domain"] for route in routes]
+        self.route_priority: List[int] = [len(routes)] * size
+        for priority, triggers in enumerate(route_triggers):
+            for pid in triggers:
+                self.route_priority[pid] = min(self.route_priority[pid], priority)
+
+        # A keyword listed twice in a domain counts twice, as in the list-based scan
+        self.support_weights: Dict[str, List[int]] = {}
+        self.refute_weights: Dict[str, List[int]] = {}
+        for name, (support_ids, refute_ids) in domain_keywords.items():
+            support, refute = [0] * size, [0] * size
+            for pid in support_ids:
+                support[pid] += 1
+            for pid in refute_ids:
+                refute[pid] += 1
+            self.support_weights[name] = support
+            self.refute_weights[name] = refute
+
+    def route(self, claim_lower: str) -> str:
+        """Domain of the first route whose triggers occur in the claim."""
+        priority = min((self.route_priority[pid] for pid in self.automaton.find(claim_lower)),
+                       default=len(self.route_domains))
+        if priority < len(self.route_domains):
+            return self.route_domains[priority]
+        return self.default_domain
+
+    def score(self, domain: str, text_lower: str) -> Tuple[int, int]:
+        """(support, refute) keyword counts found in the text for the domain."""
+        support_weights = self.support_weights[domain]
+        refute_weights = self.refute_weights[domain]
+        support = refute = 0
+        for pid in self.automaton.find(text_lower):
+            support += support_weights[pid]
+            refute += refute_weights[pid]
+        return support, refute
+
+    def score_many(self, domains: List[str], texts_lower: List[str]) -> Tuple["np.ndarray", "np.ndarray"]:
+        """Vectorized score(): (support, refute) arrays for texts paired with their domains.
+
+        Each text contributes its distinct pattern hits to a sparse (row, pattern)
+        coordinate list; per-domain weight matrices turn the hits into scores with
+        a gather and a bincount instead of per-keyword Python loops.
+        """
+        support_matrix, refute_matrix, domain_index = self._weight_matrices()
+
+        rows: List[int] = []
+        cols: List[int] = []
+        for row, text in enumerate(texts_lower):
+            hits = self.automaton.find(text)
+            rows.extend([row] * len(hits))
+            cols.extend(hits)
+
+        count = len(texts_lower)
+        if not rows:
+            return np.zeros(count, dtype=np.int64), np.zeros(count, dtype=np.int64)
+
+        row_array = np.asarray(rows, dtype=np.int64)
+        col_array = np.asarray(cols, dtype=np.int64)
+        row_domains = np.asarray([domain_index[d] for d in domains], dtype=np.int64)[row_array]
+        support = np.bincount(row_array, weights=support_matrix[row_domains, col_array], minlength=count)
+        refute = np.bincount(row_array, weights=refute_matrix[row_domains, col_array], minlength=count)
+        return support.astype(np.int64), refute.astype(np.int64)
+
+    def _weight_matrices(self):
+        """Domain x pattern weight matrices, built on first use (not part of the snapshot)."""
+        matrices = self.__dict__.get("_matrices")
+        if matrices is None:
+            names = list(self.support_weights)
+            matrices = (
+                np.asarray([self.support_weights[name] for name in names], dtype=np.int64),
+                np.asarray([self.refute_weights[name] for name in names], dtype=np.int64),
+                {name: i for i, name in enumerate(names)}
+            )
+            self._matrices = matrices
+        return matrices
+
+    def to_snapshot(self) -> Dict:
+        """JSON-serializable compiled tables, loadable without recompiling."""
+        snapshot = {field: getattr(self, field) for field in self.SNAPSHOT_FIELDS}
+        automaton = self.automaton
+        snapshot["automaton"] = {"patterns": automaton.patterns, "goto": automaton.goto,
+                                 "fail": automaton.fail, "output": automaton.output}
+        return snapshot
+
+    @classmethod
+    def from_snapshot(cls, snapshot: Dict) -> "CompiledLexicon":
+        compiled = cls.__new__(cls)
+        for field in cls.SNAPSHOT_FIELDS:
+            setattr(compiled, field, snapshot[field])
+        compiled.automaton = AhoCorasick.from_tables(**snapshot["automaton"])
+        return compiled
+
+
+class LexiconManager:
+    """Loads the lexicon file, caches compiled snapshots on disk and hot-swaps on change.
+
+    Readers take the current CompiledLexicon reference once per classification;
+    reloads compile on a background thread and replace that reference atomically,
+    so in-flight classifications are never paused or see a half-built matcher.
+    """
+
+    def __init__(self, path: str, snapshot_dir: Optional[str], reload_interval: float):
+        self.path = path
+        self.snapshot_dir = snapshot_dir
+        self.reload_interval = reload_interval
+        self.reload_lock = threading.Lock()
+        self.reloads = 0
+        self.file_state = self._file_state()
+        self.compiled = self._load()
+        self.next_check = time.monotonic() + reload_interval
+
+    def current(self) -> CompiledLexicon:
+        """The active compiled lexicon; schedules a reload if the file has changed."""
+        if self.reload_interval > 0 and time.monotonic() >= self.next_check:
+            self.next_check = time.monotonic() + self.reload_interval
+            if self._file_state() != self.file_state and self.reload_lock.acquire(blocking=False):
+                threading.Thread(target=self._reload, name="lexicon-reload", daemon=True).start()
+        return self.compiled
+
+    def _file_state(self) -> Tuple[float, int]:
+        try:
+            stat = os.stat(self.path)
+            return stat.st_mtime, stat.st_size
+        except OSError:
+            return 0.0, -1
+
+    def _reload(self):
+        # Recorded up front so a broken file is retried only after it changes again
+        self.file_state = self._file_state()
+        try:
+            compiled = self._load()
+            self.compiled = compiled
+            self.reloads += 1
+            logger.info(f"Keyword lexicon reloaded (version {compiled.version})")
+        except Exception as e:
+            logger.warning(f"Keyword lexicon reload failed, keeping previous version: {e}")
+        finally:
+            self.reload_lock.release()
+
+    def _load(self) -> CompiledLexicon:
+        """Compile the lexicon file, reusing a cached snapshot of identical content.
+
+        Snapshots are plain JSON tables, so a tampered snapshot directory can at
+        worst corrupt keyword scores, never run code.
+        """
+        with open(self.path, "rb") as f:
+            content = f.read()
+        digest = hashlib.sha256(content).hexdigest()[:16]
+
+        snapshot_path = None
+        if self.snapshot_dir:
+            snapshot_path = os.path.join(self.snapshot_dir, f"lexicon-{digest}-v{SNAPSHOT_FORMAT}.json")
+            try:
+                with open(snapshot_path, encoding="utf-8") as f:
+                    return CompiledLexicon.from_snapshot(json.load(f))
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable lexicon snapshot: {e}")
+
+        compiled = CompiledLexicon(json.loads(content.decode("utf-8")))
+
+        if snapshot_path:
+            try:
+                os.makedirs(self.snapshot_dir, exist_ok=True)
+                tmp_path = f"{snapshot_path}.{os.getpid()}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(compiled.to_snapshot(), f, ensure_ascii=False, separators=(",", ":"))
+                os.replace(tmp_path, snapshot_path)
+            except OSError as e:
+                logger.warning(f"Could not write lexicon snapshot: {e}")
+        return compiled
@@ -0,0 +1,220 @@
+"""
+Rate limiting and concurrency governors for external backends
+"""
+
+import time
+import asyncio
+import threading
+from typing import Dict, Optional
+
+from caching import SQLiteStore
+
+
+class TokenBucket:
+    """Thread-safe token bucket allowing `rate` requests per second with bursts up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = max(1.0, capacity)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def try_acquire(self) -> float:
+        """Take a token if one is available; otherwise return the seconds until one is."""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate
+
+    def acquire(self):
+        while True:
+            wait = self.try_acquire()
+            if wait <= 0:
+                return
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        while True:
+            wait = self.try_acquire()
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+
+    async def try_acquire_async(self) -> float:
+        return self.try_acquire()
+
+
+class SQLiteTokenBucket(TokenBucket):
+    """Token bucket whose state lives in a SQLite file shared by every process on the host.
+
+    Each acquisition refills and debits the named bucket inside one
+    BEGIN IMMEDIATE transaction, so concurrent workers never double-spend a
+    token. Wall-clock time is used because monotonic clocks are per-process.
+    """
+
+    def __init__(self, path: str, name: str, rate: float, capacity: float):
+        self.name = name
+        self.rate = rate
+        self.capacity = max(1.0, capacity)
+        self.store = SQLiteStore(path)
+        with self.store.lock:
+            self.store.conn.execute(
+                "CREATE TABLE IF NOT EXISTS rate_limits ("
+                "name TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL)"
+            )
+
+    def try_acquire(self) -> float:
+        conn = self.store.conn
+        with self.store.lock:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                now = time.time()
+                row = conn.execute(
+                    "SELECT tokens, updated_at FROM rate_limits WHERE name = ?", (self.name,)
+                ).fetchone()
+                if row is None:
+                    tokens = self.capacity
+                else:
+                    tokens = min(self.capacity, row[0] + max(0.0, now - row[1]) * self.rate)
+                if tokens >= 1:
+                    tokens -= 1
+                    wait = 0.0
+                else:
+                    wait = (1 - tokens) / self.rate
+                conn.execute(
+                    "INSERT OR REPLACE INTO rate_limits (name, tokens, updated_at) VALUES (?, ?, ?)",
+                    (self.name, tokens, now)
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return wait
+
+    async def acquire_async(self):
+        # BEGIN IMMEDIATE can wait out the store's busy timeout while other
+        # processes hold the lock, so the transaction runs off the event loop
+        while True:
+            wait = await asyncio.to_thread(self.try_acquire)
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+
+    async def try_acquire_async(self) -> float:
+        return await asyncio.to_thread(self.try_acquire)
+
+    def close(self):
+        self.store.close()
+
+
+class LimiterTimeout(TimeoutError):
+    """A request waited too long in the local limiter queue; the backend was never called."""
+
+
+class BackendLimiter:
+    """Request rate limit plus concurrency cap for one backend.
+
+    Works as a context manager from threads (`with`) and from asyncio tasks
+    (`async with`); both share the same bucket and slots. Time spent queueing
+    is recorded so limits can be tuned against provider quotas. A request
+    whose work moves to another thread can instead take its slot with
+    acquire_async() and hand release() to that thread.
+    """
+
+    def __init__(self, name: str, rate: float, burst: float, max_concurrency: int,
+                 bucket: Optional[TokenBucket] = None):
+        self.name = name
+        self.bucket = bucket if bucket is not None else (TokenBucket(rate, burst) if rate > 0 else None)
+        self.slots = threading.BoundedSemaphore(max_concurrency) if max_concurrency > 0 else None
+        self.stats_lock = threading.Lock()
+        self.acquisitions = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def __enter__(self):
+        start = time.monotonic()
+        if self.slots:
+            self.slots.acquire()
+        try:
+            if self.bucket:
+                self.bucket.acquire()
+        except BaseException:
+            self._release_slot()
+            raise
+        self._record_wait(time.monotonic() - start)
+        return self
+
+    def __exit__(self, *exc_info):
+        self._release_slot()
+
+    async def __aenter__(self):
+        await self.acquire_async()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self._release_slot()
+
+    async def acquire_async(self, timeout: Optional[float] = None):
+        """Take a slot and a token, raising LimiterTimeout if that takes longer than timeout."""
+        try:
+            await asyncio.wait_for(self._acquire_async(), timeout)
+        except asyncio.TimeoutError:
+            raise LimiterTimeout(f"{self.name} limiter queue exceeded {timeout}s") from None
+
+    async def _acquire_async(self):
+        start = time.monotonic()
+        if self.slots:
+            # Slots are shared with threads, so poll instead of blocking the event loop
+            delay = 0.001
+            while not self.slots.acquire(blocking=False):
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 0.05)
+        try:
+            if self.bucket:
+                await self.bucket.acquire_async()
+        except BaseException:
+            self._release_slot()
+            raise
+        self._record_wait(time.monotonic() - start)
+
+    async def try_acquire_async(self) -> bool:
+        """Take a slot and a token only if both are free right now."""
+        if self.slots and not self.slots.acquire(blocking=False):
+            return False
+        try:
+            if self.bucket and await self.bucket.try_acquire_async() > 0:
+                self._release_slot()
+                return False
+        except BaseException:
+            self._release_slot()
+            raise
+        self._record_wait(0.0)
+        return True
+
+    def release(self):
+        """Give back the slot taken by acquire_async() or try_acquire_async()."""
+        self._release_slot()
+
+    def _release_slot(self):
+        if self.slots:
+            self.slots.release()
+
+    def _record_wait(self, wait: float):
+        with self.stats_lock:
+            self.acquisitions += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+
+    def stats(self) -> Dict[str, float]:
+        with self.stats_lock:
+            return {
+                "acquisitions": self.acquisitions,
+                "total_wait": self.total_wait,
+                "average_wait": self.total_wait / self.acquisitions if self.acquisitions else 0.0,
+                "max_wait": self.max_wait
+            }
@@ -0,0 +1,190 @@
+"""
+Latency tracking, circuit breaking and SLO-driven degradation for unreliable backends
+"""
+
+import time
+import logging
+import threading
+from collections import deque
+from typing import Dict
+
+logger = logging.getLogger(__name__)
+
+
+class LatencyTracker:
+    """Rolling window of call latencies with percentile estimates."""
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self.samples = deque(maxlen=window)
+        self.min_samples = min_samples
+        self.lock = threading.Lock()
+
+    def record(self, seconds: float):
+        with self.lock:
+            self.samples.append(seconds)
+
+    def percentile(self, q: float, default: float) -> float:
+        """Latency at quantile q (0-1) of the window, or the default until enough samples exist."""
+        with self.lock:
+            if len(self.samples) < self.min_samples:
+                return default
+            ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def stats(self) -> Dict[str, float]:
+        with self.lock:
+            count = len(self.samples)
+        return {
+            "samples": count,
+            "p50": self.percentile(0.5, 0.0),
+            "p95": self.percentile(0.95, 0.0)
+        }
+
+
+class CircuitBreaker:
+    """Stop calling a backend after consecutive failures, then probe it again after a cooldown.
+
+    Closed: calls pass. Open: calls are refused until the cooldown elapses.
+    Half-open: one probe call per cooldown is let through; its success closes
+    the breaker and its failure opens it again. A probe that never reports
+    back (e.g. cancelled) simply lets another probe through a cooldown later.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, cooldown: float):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.state = self.CLOSED
+        self.failures = 0
+        self.changed_at = 0.0
+        self.trips = 0
+        self.rejected = 0
+        self.lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Whether a call may go to the backend now."""
+        with self.lock:
+            if self.state == self.CLOSED:
+                return True
+            now = time.monotonic()
+            if now - self.changed_at >= self.cooldown:
+                self.state = self.HALF_OPEN
+                self.changed_at = now
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self):
+        with self.lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state == self.CLOSED:
+                    self.trips += 1
+                self.state = self.OPEN
+                self.changed_at = time.monotonic()
+
+    def stats(self) -> Dict[str, float]:
+        with self.lock:
+            return {
+                "state": self.state,
+                "consecutive_failures": self.failures,
+                "trips": self.trips,
+                "rejected": self.rejected
+            }
+
+
+class SLOController:
+    """Degrade away from a backend whose rolling latency or error rate breaches its SLO.
+
+    Outcomes of recent calls are kept in a window; once it holds enough samples
+    and its p95 latency exceeds latency_slo or its error rate exceeds
+    max_error_rate, the backend is marked degraded. While degraded, allow()
+    lets one probe call through per probe_interval, and only the probe's
+    outcome counts: a healthy answer (successful and within the latency SLO)
+    restores normal routing. Calls still in flight from before the probe was
+    let through are ignored, so they cannot end a degradation.
+    """
+
+    def __init__(self, name: str, latency_slo: float, max_error_rate: float, window: int = 50,
+                 min_samples: int = 10, probe_interval: float = 30.0):
+        self.name = name
+        self.latency_slo = latency_slo
+        self.max_error_rate = max_error_rate
+        self.min_samples = min_samples
+        self.probe_interval = probe_interval
+        self.outcomes = deque(maxlen=window)
+        self.degraded = False
+        self.last_probe = 0.0
+        self.probe_pending = False
+        self.degradations = 0
+        self.probes = 0
+        self.rejected = 0
+        self.lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Whether a call may go to the backend now (always, unless degraded and not probing)."""
+        with self.lock:
+            if not self.degraded:
+                return True
+            now = time.monotonic()
+            if now - self.last_probe >= self.probe_interval:
+                self.last_probe = now
+                self.probe_pending = True
+                self.probes += 1
+                return True
+            self.rejected += 1
+            return False
+
+    def record(self, seconds: float, ok: bool):
+        """Record the latency and success of one backend call that has just finished."""
+        with self.lock:
+            if self.degraded:
+                # The first call started after the latest probe was let through is the probe
+                started = time.monotonic() - seconds
+                if not self.probe_pending or started < self.last_probe:
+                    return
+                self.probe_pending = False
+                if ok and seconds <= self.latency_slo:
+                    self.degraded = False
+                    self.outcomes.clear()
+                    logger.info(f"{self.name} back within SLO, resuming normal routing")
+                return
+
+            self.outcomes.append((seconds, ok))
+            if len(self.outcomes) < self.min_samples:
+                return
+            p95, error_rate = self._window_stats()
+            if p95 > self.latency_slo or error_rate > self.max_error_rate:
+                self.degraded = True
+                self.last_probe = time.monotonic()
+                self.probe_pending = False
+                self.degradations += 1
+                self.outcomes.clear()
+                logger.warning(f"{self.name} SLO breached (p95 {p95:.2f}s, errors {error_rate:.0%}), "
+                               f"degrading to fallback")
+
+    def _window_stats(self):
+        latencies = sorted(seconds for seconds, _ in self.outcomes)
+        p95 = latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))] if latencies else 0.0
+        error_rate = sum(1 for _, ok in self.outcomes if not ok) / len(self.outcomes) if self.outcomes else 0.0
+        return p95, error_rate
+
+    def stats(self) -> Dict[str, float]:
+        with self.lock:
+            p95, error_rate = self._window_stats()
+            return {
+                "degraded": self.degraded,
+                "window_p95": p95,
+                "window_error_rate": error_rate,
+                "degradations": self.degradations,
+                "probes": self.probes,
+                "rejected": self.rejected
+            }
@@ -0,0 +1,167 @@
+"""
+Pluggable search backends returning DuckDuckGo-shaped results
+"""
+
+import os
+import json
+import logging
+from contextlib import nullcontext
+from typing import Dict, Iterator, List, Optional
+from urllib.parse import urlsplit, urlunsplit
+
+try:
+    from duckduckgo_search import DDGS
+    DUCKDUCKGO_AVAILABLE = True
+except ImportError:
+    DUCKDUCKGO_AVAILABLE = False
+
+from bm25_index import BM25Index
+from claim_index import claim_tokens
+from evidence_index import DemoSourceIndex
+
+logger = logging.getLogger(__name__)
+
+
+def canonical_url(url: str) -> str:
+    """URL form used to merge results: lowercase host without "www.", no fragment or trailing slash."""
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    return urlunsplit((parts.scheme.lower(), host, parts.path.rstrip("/"), parts.query, ""))
+
+
+class SearchBackend:
+    """A search source; results are dicts with "title", "body" and "href" like DDGS.text()."""
+
+    name = "backend"
+    live = False  # live web results may be cached; local evidence is not
+
+    def available(self) -> bool:
+        return True
+
+    def search(self, query: str, max_results: int) -> List[Dict]:
+        raise NotImplementedError
+
+
+class DuckDuckGoBackend(SearchBackend):
+    """Live DuckDuckGo text search, throttled by the shared search limiter."""
+
+    name = "duckduckgo"
+    live = True
+
+    def __init__(self, limiter=None, timeout: float = 10):
+        self.limiter = limiter
+        self.timeout = timeout
+
+    def available(self) -> bool:
+        return DUCKDUCKGO_AVAILABLE
+
+    def search(self, query: str, max_results: int) -> List[Dict]:
+        return list(self.iter_results(query, max_results))
+
+    def iter_results(self, query: str, max_results: int, throttle: bool = True) -> Iterator[Dict]:
+        """Iterate results as the client produces them; throttle=False when the caller holds the limiter."""
+        with (self.limiter if throttle and self.limiter else nullcontext()), DDGS(timeout=self.timeout) as ddgs:
+            for result in ddgs.text(query, max_results=max_results) or []:
+                yield result
+
+
+class DemoCorpusBackend(SearchBackend):
+    """The curated offline evidence: sources of the best-matching demo entry."""
+
+    name = "demo"
+
+    def __init__(self, index: DemoSourceIndex, min_score: float = 1):
+        self.index = index
+        self.min_score = min_score
+
+    def search(self, query: str, max_results: int) -> List[Dict]:
+        match = self.index.best_match(query, self.min_score)
+        if match is None:
+            return []
+        entry, _ = match
+        return [{"title": source["title"], "body": source["snippet"], "href": source["link"]}
+                for source in entry["sources"][:max_results]]
+
+
+class ArchiveBackend(SearchBackend):
+    """Local stand-in for the fact-check archive: a JSONL file of {"title", "snippet", "link"} records.
+
+    Records are ranked by the share of the query's content tokens they contain.
+    """
+
+    name = "archive"
+
+    def __init__(self, path: str, min_overlap: float = 0.5):
+        self.path = path
+        self.min_overlap = min_overlap
+        self.records: List[Dict] = []
+        self.postings: Dict[str, List[int]] = {}
+        if os.path.exists(path):
+            self._load()
+
+    def _load(self):
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError as e:
+                    logger.warning(f"Skipping malformed archive record: {e}")
+                    continue
+                record_id = len(self.records)
+                self.records.append(record)
+                for token in set(claim_tokens(f"{record.get('title', '')} {record.get('snippet', '')}")):
+                    self.postings.setdefault(token, []).append(record_id)
+
+    def available(self) -> bool:
+        return bool(self.records)
+
+    def search(self, query: str, max_results: int) -> List[Dict]:
+        tokens = set(claim_tokens(query))
+        if not tokens:
+            return []
+        hits: Dict[int, int] = {}
+        for token in tokens:
+            for record_id in self.postings.get(token, ()):
+                hits[record_id] = hits.get(record_id, 0) + 1
+
+        ranked = sorted((i for i in hits if hits[i] / len(tokens) >= self.min_overlap),
+                        key=lambda i: (-hits[i], i))
+        return [
+            {"title": self.records[i].get("title", ""), "body": self.records[i].get("snippet", ""),
+             "href": self.records[i].get("link", "")}
+            for i in ranked[:max_results]
+        ]
+
+
+class LocalBM25Backend(SearchBackend):
+    """Offline retrieval from the on-disk BM25 index; picks up newly committed segments."""
+
+    name = "bm25"
+
+    def __init__(self, directory: str, k1: float = 1.2, b: float = 0.75):
+        self.index = BM25Index(directory, k1, b)
+
+    def available(self) -> bool:
+        return len(self.index) > 0
+
+    def search(self, query: str, max_results: int) -> List[Dict]:
+        self.index.refresh()
+        return [{"title": doc["title"], "body": doc["snippet"], "href": doc["link"]}
+                for _, doc in self.index.search(query, max_results)]
+
+
+def merge_results(result_lists: List[List[Dict]], seen: Optional[set] = None) -> List[Dict]:
+    """Concatenate result lists, keeping the first result for each canonical URL."""
+    seen = set() if seen is None else seen
+    merged = []
+    for results in result_lists:
+        for result in results:
+            key = canonical_url(result.get("href", ""))
+            if key and key not in seen:
+                seen.add(key)
+                merged.append(result)
+    return merged
@@ -0,0 +1,42 @@
+"""
+Tests for the on-disk BM25 evidence index
+"""
+
+import tempfile
+
+from bm25_index import BM25Index
+
+DOCS = [
+    {"title": "Water boiling point", "snippet": "Water boils at 100 degrees Celsius at sea level",
+     "link": "https://example.com/boiling"},
+    {"title": "Jupiter facts", "snippet": "Jupiter is the largest planet in the Solar System",
+     "link": "https://example.com/jupiter"},
+    {"title": "Chromosomes", "snippet": "Humans have 46 chromosomes arranged in 23 pairs",
+     "link": "https://example.com/chromosomes"},
+]
+
+def test_bm25_index_segments_and_search():
+    with tempfile.TemporaryDirectory() as tmp:
+        index = BM25Index(tmp)
+        assert len(index) == 0 and index.search("water", 5) == []
+
+        # Two segments; document frequencies are combined across them
+        assert index.add_documents(DOCS, segment_size=2) == 3
+        assert index.stats()["segments"] == 2
+
+        results = index.search("Humans have 48 chromosomes", 5)
+        assert results[0][1]["link"] == "https://example.com/chromosomes"
+        assert index.search("largest planet", 1)[0][1]["title"] == "Jupiter facts"
+        assert index.search("unrelated words only", 5) == []
+
+        # A reader picks up segments committed by another writer
+        reader = BM25Index(tmp)
+        index.add_documents([{"title": "Lightning", "snippet": "Lightning can strike the same place twice",
+                              "link": "https://example.com/lightning"}])
+        assert reader.refresh() and len(reader) == 4
+        results = reader.search("Lightning never strikes the same place twice", 2)
+        print(f"BM25 results: {results}")
+        assert results[0][1]["link"] == "https://example.com/lightning"
+
+if __name__ == "__main__":
+    test_bm25_index_segments_and_search()
@@ -0,0 +1,181 @@
+"""
+Tests for the fact-checker caches
+"""
+
+import os
+import time
+import asyncio
+import sqlite3
+import tempfile
+import threading
+
+from caching import LLMResponseCache, ResultCache, SearchCache, llm_cache_key, normalize_claim
+import fact_checker_simple
+from fact_checker_simple import FactCheckResult, FactCheckerPipeline
+
+def test_search_cache():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "search.sqlite3")
+        cache = SearchCache(path, ttl=60, max_entries=2)
+        results = [{"title": "T", "snippet": "S", "link": "https://example.com"}]
+
+        assert normalize_claim("  Water boils at 100°C!  ") == normalize_claim("water BOILS at 100°c")
+        assert cache.get("a") is None
+
+        cache.put("a", results)
+        assert cache.get("a") == results
+
+        # Least recently used entry is evicted once the limit is exceeded
+        cache.put("b", results)
+        cache.get("a")
+        cache.put("c", results)
+        assert cache.get("b") is None
+        assert cache.get("a") == results
+
+        # Entries survive reopening the file
+        cache.close()
+        reopened = SearchCache(path, ttl=60, max_entries=2)
+        assert reopened.get("c") == results
+
+        # Expired entries are treated as misses
+        reopened.ttl = 0
+        time.sleep(0.01)
+        assert reopened.get("c") is None
+
+        stats = reopened.stats()
+        print(f"Search cache stats: {stats}")
+        assert stats["hits"] == 1 and stats["misses"] == 1
+        reopened.close()
+
+def test_llm_response_cache():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "llm.sqlite3")
+        cache = LLMResponseCache(path, max_memory_entries=1, max_disk_bytes=10)
+        key_a = llm_cache_key("gemini-pro", "prompt a")
+        key_b = llm_cache_key("gemini-pro", "prompt b")
+
+        assert key_a != llm_cache_key("other-model", "prompt a")
+        assert cache.get(key_a) is None
+
+        cache.put(key_a, "12345")
+        cache.put(key_b, "67890")
+        assert cache.get(key_b) == "67890"  # memory tier
+        assert cache.get(key_a) == "12345"  # disk tier, promoted to memory
+
+        # Disk tier is bounded by total response size
+        cache.put(llm_cache_key("gemini-pro", "prompt c"), "abcde")
+        stats = cache.stats()
+        print(f"LLM cache stats: {stats}")
+        assert stats["disk_bytes"] <= 10
+        assert stats["memory_hits"] == 1 and stats["disk_hits"] == 1
+        cache.close()
+
+def test_result_cache():
+    cache = ResultCache(soft_ttl=60, hard_ttl=120, max_entries=10)
+    assert cache.get("claim") == (None, False)
+
+    cache.put("claim", "verdict")
+    assert cache.get("claim") == ("verdict", False)
+
+    # Past the soft TTL the value is still served, flagged as stale
+    cache.soft_ttl = 0
+    time.sleep(0.01)
+    assert cache.get("claim") == ("verdict", True)
+
+    # Past the hard TTL the entry is gone
+    cache.hard_ttl = 0
+    assert cache.get("claim") == (None, False)
+    print(f"Result cache stats: {cache.stats()}")
+
+def test_pipeline_serves_stale_results_while_refreshing():
+    pipeline = FactCheckerPipeline()
+    pipeline.result_cache = ResultCache(soft_ttl=60, hard_ttl=120, max_entries=10)
+    verdicts = iter(["True", "False"])
+    executions = []
+
+    async def fake_uncached(claim, options):
+        executions.append(claim)
+        await asyncio.sleep(0.2)
+        return FactCheckResult(claim=claim, sources=[], verdict=next(verdicts), confidence=0.9,
+                               reasoning="fake", social_post="", processing_time=0.2)
+
+    pipeline._process_claim_uncached = fake_uncached
+    assert pipeline.process_claim("A claim").verdict == "True"
+
+    # Past the soft TTL every caller gets the old verdict at once; one refresh runs behind them
+    pipeline.result_cache.soft_ttl = 0
+    time.sleep(0.01)
+    for _ in range(3):
+        result = pipeline.process_claim("A claim")
+        assert (result.verdict, result.cached, result.stale) == ("True", True, True)
+        assert result.processing_time < 0.2
+    deadline = time.time() + 5
+    while pipeline.refreshing and time.time() < deadline:
+        time.sleep(0.01)
+    assert len(executions) == 2
+
+    # The refreshed result replaces the stale one
+    pipeline.result_cache.soft_ttl = 60
+    result = pipeline.process_claim("A claim")
+    assert (result.verdict, result.cached, result.stale) == ("False", True, False)
+
+def lock_for(path, seconds):
+    """Hold the SQLite write lock from another connection, as a concurrent process would."""
+    other = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+    other.execute("BEGIN IMMEDIATE")
+    threading.Timer(seconds, lambda: (other.execute("COMMIT"), other.close())).start()
+
+def run_with_ticker(coro):
+    """Run the coroutine and count how often the event loop got to tick meanwhile."""
+    async def run():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.02)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        result = await coro
+        task.cancel()
+        return result, ticks
+
+    return asyncio.run(run())
+
+def test_pipeline_search_cache_waits_off_the_event_loop():
+    results = [{"title": "Cached report", "snippet": "S", "link": "https://example.com/cached"}]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "search.sqlite3")
+        pipeline = FactCheckerPipeline()
+        pipeline.claim_index = None
+        pipeline.search_cache = SearchCache(path, ttl=60, max_entries=10)
+        pipeline.search_cache.put(f"5|{normalize_claim('A claim')}", results)
+
+        lock_for(path, 0.3)
+        sources, ticks = run_with_ticker(pipeline.search_claim_async("A claim", 5))
+        assert [s.link for s in sources] == ["https://example.com/cached"]
+        assert ticks >= 5, f"event loop stalled while waiting on the cache ({ticks} ticks)"
+        pipeline.search_cache.close()
+
+def test_pipeline_llm_cache_waits_off_the_event_loop():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "llm.sqlite3")
+        pipeline = FactCheckerPipeline()
+        pipeline.llm_cache = LLMResponseCache(path, max_memory_entries=0, max_disk_bytes=1024)
+        pipeline.llm_cache.put(llm_cache_key(fact_checker_simple.GEMINI_MODEL_NAME, "A prompt"), "Cached reply")
+
+        # A disk hit refreshes last_access, which needs the write lock
+        lock_for(path, 0.3)
+        reply, ticks = run_with_ticker(pipeline._gemini_generate_async("A prompt"))
+        assert reply == "Cached reply"
+        assert ticks >= 5, f"event loop stalled while waiting on the cache ({ticks} ticks)"
+        pipeline.llm_cache.close()
+
+if __name__ == "__main__":
+    test_search_cache()
+    test_llm_response_cache()
+    test_result_cache()
+    test_pipeline_serves_stale_results_while_refreshing()
+    test_pipeline_search_cache_waits_off_the_event_loop()
+    test_pipeline_llm_cache_waits_off_the_event_loop()
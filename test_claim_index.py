@@ -0,0 +1,75 @@
+"""
+Tests for claim canonicalization and near-duplicate lookup
+"""
+
+import time
+
+import fact_checker_simple
+from claim_index import NearDuplicateIndex, canonicalize_claim
+from fact_checker_simple import FactCheckerPipeline
+
+def test_near_duplicate_lookup():
+    index = NearDuplicateIndex(threshold=0.75)
+    index.add("great wall of china visible from space!", "great-wall-evidence")
+
+    print(f"Canonical: {canonicalize_claim('The Great Wall is visible from space')}")
+    assert canonicalize_claim("Vaccines cause autism.") == canonicalize_claim("vaccine causes AUTISM")
+
+    similarity, evidence = index.lookup("The Great Wall is visible from space")
+    assert evidence == "great-wall-evidence" and similarity >= 0.75
+    assert index.lookup("Jupiter is the largest planet") is None
+
+    # A stricter threshold rejects the same rephrasing
+    index.threshold = 0.9
+    assert index.lookup("The Great Wall is visible from space") is None
+
+def test_entries_expire_and_are_bounded():
+    index = NearDuplicateIndex(threshold=0.75, ttl=0.05)
+    index.add("great wall of china visible from space!", "great-wall-evidence")
+    assert index.lookup("The Great Wall of China is visible from space")[1] == "great-wall-evidence"
+    time.sleep(0.1)
+    # Neither the exact canonical match nor a rephrasing outlives the TTL
+    assert index.lookup("The Great Wall of China is visible from space") is None
+    index.add("great wall of china visible from space!", "great-wall-evidence")
+    time.sleep(0.1)
+    assert index.lookup("The Great Wall is visible from space") is None
+    assert len(index) == 0 and index.stats()["expired"] == 2
+
+    index = NearDuplicateIndex(threshold=0.75, max_entries=2)
+    index.add("Vaccines cause autism", "vaccines")
+    index.add("The moon landing was faked", "moon")
+    index.lookup("vaccine causes AUTISM")
+    index.add("Water boils at 100 degrees", "water")
+    # The least recently used claim is evicted, not the oldest one
+    assert index.lookup("The moon landing was faked") is None
+    assert index.lookup("Vaccines cause autism")[1] == "vaccines"
+    assert len(index) == 2 and index.stats()["evictions"] == 1
+    assert sum(len(bucket) for bucket in index.buckets[0].values()) == 2
+
+def test_pipeline_reuses_evidence_of_near_duplicate_claim():
+    pipeline = FactCheckerPipeline()
+    pipeline.search_cache = None
+    pipeline.claim_index = NearDuplicateIndex(threshold=0.75)
+    searches = []
+
+    def fake_search(claim, max_results):
+        searches.append(claim)
+        return [{"title": "Great Wall myth", "body": "Not visible from space", "href": "https://example.com/wall"}]
+
+    pipeline._ddgs_text = fake_search
+    live = fact_checker_simple.DUCKDUCKGO_AVAILABLE
+    fact_checker_simple.DUCKDUCKGO_AVAILABLE = True
+    try:
+        first = pipeline.search_claim("The Great Wall of China is visible from space.")
+        second = pipeline.search_claim("great wall of china visible from space!")
+    finally:
+        fact_checker_simple.DUCKDUCKGO_AVAILABLE = live
+
+    assert len(searches) == 1
+    assert [s.link for s in second] == [s.link for s in first] == ["https://example.com/wall"]
+    assert pipeline.cache_stats()["near_duplicate"]["entries"] == 1
+
+if __name__ == "__main__":
+    test_near_duplicate_lookup()
+    test_entries_expire_and_are_bounded()
+    test_pipeline_reuses_evidence_of_near_duplicate_claim()
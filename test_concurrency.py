@@ -0,0 +1,142 @@
+"""
+Tests for batch processing, single-flight claim coalescing and Gemini micro-batching
+"""
+
+import asyncio
+import threading
+
+from concurrency import MicroBatcher, SingleFlight
+from fact_checker_simple import FactCheckResult, FactCheckerPipeline
+
+CLAIM = "Water boils at 100°C at sea level."
+
+def counting_pipeline(delay=0.1):
+    """Pipeline whose claim computation is a slow fake that counts its executions."""
+    pipeline = FactCheckerPipeline()
+    pipeline.result_cache = None
+    executions = []
+
+    async def fake_uncached(claim, options):
+        executions.append(claim)
+        await asyncio.sleep(delay)
+        return FactCheckResult(claim=claim, sources=[], verdict="True", confidence=0.9, reasoning="fake",
+                               social_post="", processing_time=delay)
+
+    pipeline._process_claim_uncached = fake_uncached
+    return pipeline, executions
+
+def test_batch_keeps_order_and_isolates_failures():
+    pipeline = FactCheckerPipeline()
+    pipeline.result_cache = None
+    claims = ["Claim one", "Claim two", "Claim three", "Claim four"]
+
+    async def fake_uncached(claim, options):
+        if claim == "Claim two":
+            raise RuntimeError("backend exploded")
+        # Later claims finish first
+        await asyncio.sleep(0.05 * (len(claims) - claims.index(claim)))
+        return FactCheckResult(claim=claim, sources=[], verdict="True", confidence=0.9, reasoning="fake",
+                               social_post="", processing_time=0.0)
+
+    pipeline._process_claim_uncached = fake_uncached
+    results = pipeline.process_claims(claims, max_concurrency=8)
+    assert [r.claim for r in results] == claims
+    assert [r.verdict for r in results] == ["True", "Error", "True", "True"]
+    assert "backend exploded" in results[1].reasoning
+
+    stats = pipeline.last_batch_stats
+    print(f"Batch stats: {stats}")
+    assert stats["claims"] == 4 and stats["errors"] == 1
+    # Concurrency is capped at the batch size
+    assert stats["max_concurrency"] == 4
+    assert 0 < stats["elapsed"] < 0.3 and stats["claims_per_second"] > 0
+
+def test_single_flight_coalesces_tasks():
+    pipeline, executions = counting_pipeline()
+    claims = [CLAIM, CLAIM.upper(), f"  {CLAIM}  ", CLAIM]
+    results = pipeline.process_claims(claims)
+    assert len(executions) == 1
+    assert [r.claim for r in results] == claims and {r.verdict for r in results} == {"True"}
+    assert pipeline.single_flight.stats()["coalesced"] == 3
+
+def test_single_flight_coalesces_threads():
+    pipeline, executions = counting_pipeline()
+    barrier = threading.Barrier(4)
+    results = []
+
+    def worker():
+        barrier.wait()
+        # Each sync call runs on its own event loop
+        results.append(pipeline.process_claim(CLAIM))
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    print(f"Single-flight stats: {pipeline.single_flight.stats()}")
+    assert len(executions) == 1 and len(results) == 4
+
+    # Once the computation has finished, the next call runs again
+    pipeline.process_claim(CLAIM)
+    assert len(executions) == 2
+
+def test_single_flight_survives_a_cancelled_leader():
+    pipeline, executions = counting_pipeline(delay=0.2)
+
+    async def leader_times_out():
+        leader = asyncio.create_task(asyncio.wait_for(pipeline.process_claim_async(CLAIM), 0.05))
+        await asyncio.sleep(0.01)
+        return await asyncio.gather(leader, pipeline.process_claim_async(CLAIM), return_exceptions=True)
+
+    leader, waiter = asyncio.run(leader_times_out())
+    # Only the caller that set the timeout sees it; the work finishes for the waiter
+    assert isinstance(leader, asyncio.TimeoutError)
+    assert waiter.verdict == "True" and len(executions) == 1
+
+    # When the leader's event loop shuts down, a waiter takes the work over
+    flight = SingleFlight()
+    started = threading.Event()
+
+    async def slow():
+        started.set()
+        await asyncio.sleep(0.2)
+        return "done"
+
+    def abandoning_leader():
+        try:
+            asyncio.run(asyncio.wait_for(flight.do("key", slow), 0.05))
+        except asyncio.TimeoutError:
+            pass
+
+    thread = threading.Thread(target=abandoning_leader)
+    thread.start()
+    started.wait()
+    assert asyncio.run(flight.do("key", slow)) == "done"
+    thread.join()
+    assert flight.stats()["executions"] == 2
+
+def test_micro_batcher_groups_concurrent_items():
+    batches = []
+
+    async def handler(items):
+        batches.append(items)
+        return [ValueError(item) if item == "bad" else item.upper() for item in items]
+
+    batcher = MicroBatcher(handler, window=0.05, max_batch=3)
+
+    async def submit_all(items):
+        return await asyncio.gather(*(batcher.submit(item) for item in items), return_exceptions=True)
+
+    results = asyncio.run(submit_all(["a", "bad", "c", "d"]))
+    # A full batch is sent at once; the remainder waits out the window
+    assert batches == [["a", "bad", "c"], ["d"]]
+    assert results[0] == "A" and isinstance(results[1], ValueError) and results[2:] == ["C", "D"]
+    assert batcher.stats()["batches"] == 2
+
+if __name__ == "__main__":
+    test_batch_keeps_order_and_isolates_failures()
+    test_single_flight_coalesces_tasks()
+    test_single_flight_coalesces_threads()
+    test_single_flight_survives_a_cancelled_leader()
+    test_micro_batcher_groups_concurrent_items()
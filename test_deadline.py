@@ -0,0 +1,30 @@
+"""
+Tests for per-claim deadlines
+"""
+
+import time
+
+from fact_checker_simple import Deadline, FactCheckerPipeline
+
+def test_deadline_budget():
+    deadline = Deadline(5.0)
+    assert 4.5 < deadline.budget() <= 5.0
+    assert deadline.allows(1.0) and not deadline.cut_short
+
+    assert not Deadline(0.1).allows(1.0)
+    expired = Deadline(0.0)
+    assert expired.budget() == 0.0
+    assert not expired.allows(0.5) and expired.cut_short
+
+def test_expired_deadline_returns_best_effort_result():
+    pipeline = FactCheckerPipeline()
+    start = time.time()
+    result = pipeline.process_claim("Water boils at 100°C at sea level.", use_cache=False, deadline=0.0)
+    print(f"Best-effort verdict: {result.verdict} (partial={result.partial})")
+    assert time.time() - start < 1.0
+    assert result.partial and result.sources
+    assert result.verdict != "Error"
+
+if __name__ == "__main__":
+    test_deadline_budget()
+    test_expired_deadline_returns_best_effort_result()
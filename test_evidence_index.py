@@ -0,0 +1,44 @@
+"""
+Tests for the offline evidence index
+"""
+
+import random
+
+from evidence_index import DemoSourceIndex
+from fact_checker_simple import DEMO_SOURCES
+from config import SAMPLE_CLAIMS
+
+def linear_best_match(entries, claim):
+    """Reference implementation: the original scan over every entry."""
+    claim_lower = claim.lower()
+    best_match, best_score = None, 0
+    for key, data in entries.items():
+        keywords = key.split()
+        score = 0
+        for keyword in keywords:
+            if keyword in claim_lower:
+                score += 1
+        for word in claim_lower.split():
+            if any(word in keyword for keyword in keywords):
+                score += 0.5
+        if score > best_score:
+            best_score, best_match = score, data
+    return (best_match, best_score) if best_match and best_score >= 1 else None
+
+def test_demo_index_matches_linear_scan():
+    index = DemoSourceIndex(DEMO_SOURCES)
+    claims = SAMPLE_CLAIMS + ["Is the wall visible?", "a b c", "Great Wall of China", "nothing here"]
+    for claim in claims:
+        assert index.best_match(claim) == linear_best_match(DEMO_SOURCES, claim), claim
+
+    rng = random.Random(7)
+    vocabulary = ["ab", "abc", "b", "cd", "bcd", "water", "wat", "er", "x", "planet", "net"]
+    entries = {" ".join(rng.choices(vocabulary, k=rng.randint(1, 4))) + f" e{i}": i for i in range(200)}
+    index = DemoSourceIndex(entries)
+    for _ in range(500):
+        claim = " ".join(rng.choices(vocabulary + ["e1", "e12", "zz"], k=rng.randint(1, 6)))
+        assert index.best_match(claim) == linear_best_match(entries, claim), claim
+    print("Inverted index matches the linear scan")
+
+if __name__ == "__main__":
+    test_demo_index_matches_linear_scan()
@@ -0,0 +1,303 @@
+"""
+Tests for the Gemini paths of the pipeline, run against a fake model
+"""
+
+import os
+import json
+import asyncio
+import time
+import tempfile
+import threading
+
+import fact_checker_simple
+from caching import LLMResponseCache
+from concurrency import MicroBatcher
+from fact_checker_simple import DEMO_SOURCES, FactCheckerPipeline, Source, extract_json_object
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+class FakeGeminiModel:
+    """Blocking stand-in for genai.GenerativeModel; reply(prompt) builds the response text."""
+
+    def __init__(self, reply):
+        self.reply = reply
+        self.prompts = []
+        self.lock = threading.Lock()
+
+    def generate_content(self, prompt, **kwargs):
+        with self.lock:
+            self.prompts.append(prompt)
+        return FakeResponse(self.reply(prompt))
+
+    async def generate_content_async(self, prompt, **kwargs):
+        raise AssertionError("the async client is bound to one event loop and must not be used")
+
+def label_all(label):
+    """Reply labelling every source in a classification prompt with the given label."""
+    def reply(prompt):
+        count = prompt.count("Title:")
+        return json.dumps({f"source_{i+1}": {"label": label, "confidence": 0.9, "reasoning": "fake"}
+                           for i in range(count)})
+    return reply
+
+def gemini_pipeline(reply):
+    """Pipeline wired to a fake Gemini model, with the shared on-disk caches turned off."""
+    pipeline = FactCheckerPipeline()
+    pipeline.search_cache = None
+    pipeline.llm_cache = None
+    pipeline.result_cache = None
+    pipeline.claim_index = None
+    pipeline.use_gemini = True
+    pipeline.gemini_model = FakeGeminiModel(reply)
+    return pipeline
+
+def plain_sources(count):
+    return [Source(title=f"Report {i}", snippet=f"Text of report {i}", link=f"https://example.com/{i}")
+            for i in range(count)]
+
+def test_sync_calls_reuse_gemini_across_event_loops():
+    pipeline = gemini_pipeline(label_all("SUPPORTS"))
+    # Every sync call runs on a fresh event loop
+    for _ in range(2):
+        sources = pipeline.classify_sources("A claim", plain_sources(2))
+        assert [s.classifier for s in sources] == ["gemini", "gemini"]
+    assert asyncio.run(pipeline.classify_sources_async("A claim", plain_sources(1)))[0].label == "supports"
+    assert len(pipeline.gemini_model.prompts) == 3
+    assert not pipeline.gemini_health()["degraded"]
+
+def test_unparseable_replies_are_not_cached():
+    replies = ["Sorry, I cannot help with that."]
+    good = label_all("REFUTES")
+    pipeline = gemini_pipeline(lambda prompt: replies.pop() if replies else good(prompt))
+    with tempfile.TemporaryDirectory() as tmp:
+        pipeline.llm_cache = LLMResponseCache(os.path.join(tmp, "llm.sqlite3"), 16, 1024 * 1024)
+        for _ in range(3):
+            pipeline.classify_sources("A claim", plain_sources(2))
+        # The bad reply is retried, the good one is then served from the cache
+        assert len(pipeline.gemini_model.prompts) == 2
+        assert pipeline.json_parse_stats()["failed"] == 1
+        assert pipeline.classify_sources("A claim", plain_sources(2))[0].label == "refutes"
+        pipeline.llm_cache.close()
+
+def test_streaming_early_exit_returns_settled_verdict():
+    def reply(prompt):
+        if "Title:" not in prompt:
+            return "Fact-check post"
+        if "Report 0" in prompt:
+            return json.dumps({"source_1": {"label": "SUPPORTS", "confidence": 0.9, "reasoning": "fake"},
+                               "source_2": {"label": "REFUTES", "confidence": 0.9, "reasoning": "fake"}})
+        time.sleep(0.5)
+        return label_all("UNCLEAR")(prompt)
+
+    def run(early_exit):
+        pipeline = gemini_pipeline(reply)
+        results = [{"title": s.title, "body": s.snippet, "href": s.link} for s in plain_sources(6)]
+        pipeline._ddgs_iter = lambda claim, max_results: iter(results)
+        live, enabled = fact_checker_simple.DUCKDUCKGO_AVAILABLE, fact_checker_simple.EARLY_EXIT_ENABLED
+        fact_checker_simple.DUCKDUCKGO_AVAILABLE = True
+        fact_checker_simple.EARLY_EXIT_ENABLED = early_exit
+        try:
+            start = time.time()
+            result = pipeline.process_claim("A claim", use_cache=False, stream=True)
+        finally:
+            fact_checker_simple.DUCKDUCKGO_AVAILABLE, fact_checker_simple.EARLY_EXIT_ENABLED = live, enabled
+        return result, time.time() - start
+
+    # The first chunk makes the verdict Misleading whatever the slow chunks say
+    result, elapsed = run(early_exit=True)
+    print(f"Streaming early exit: {result.verdict} from {len(result.sources)} sources")
+    assert result.verdict == "Misleading"
+    assert [s.link for s in result.sources] == ["https://example.com/0", "https://example.com/1"]
+    assert elapsed < 0.5
+
+    # With early exit off, streaming still classifies every source
+    result, elapsed = run(early_exit=False)
+    assert len(result.sources) == 6 and elapsed >= 0.5
+
+def demo_sources(key):
+    return [Source(**data) for data in DEMO_SOURCES[key]["sources"]]
+
+def test_cascade_counts_local_labels_and_avoided_calls():
+    pipeline = gemini_pipeline(label_all("SUPPORTS"))
+    # Off by default: every source goes to Gemini
+    pipeline.classify_sources("The Great Wall of China is visible from space.",
+                              demo_sources("great wall china visible space"))
+    assert len(pipeline.gemini_model.prompts) == 1 and pipeline.cascade_stats()["sources"] == 0
+
+    pipeline.classification_cascade = True
+    # Both sources are confident keyword refutes: no Gemini call at all
+    sources = pipeline.classify_sources("The Great Wall of China is visible from space.",
+                                        demo_sources("great wall china visible space"))
+    assert [s.classifier for s in sources] == ["keywords", "keywords"]
+    # One of three sources is unclear to the keyword classifier and goes to Gemini alone
+    sources = pipeline.classify_sources("Water boils at 100°C at sea level.",
+                                        demo_sources("water boils 100 degrees celsius"))
+    assert [s.classifier for s in sources] == ["gemini", "keywords", "keywords"]
+    assert len(pipeline.gemini_model.prompts) == 2 and pipeline.gemini_model.prompts[-1].count("Title:") == 1
+
+    stats = pipeline.cascade_stats()
+    print(f"Cascade stats: {stats}")
+    assert stats["sources"] == 5 and stats["accepted_locally"] == 4 and stats["llm_calls_avoided"] == 1
+    assert stats["tokens_avoided"] > 0 and stats["local_rate"] == 0.8
+
+def test_adaptive_search_widens_only_while_uncertain():
+    def gather(label, max_sources=12, max_rounds=3):
+        pipeline = gemini_pipeline(label_all(label))
+        requests = []
+
+        def fake_search(claim, max_results):
+            requests.append(max_results)
+            return [{"title": f"Report {i}", "body": f"Text of report {i}", "href": f"https://example.com/{i}"}
+                    for i in range(max_results)]
+
+        pipeline._ddgs_text = fake_search
+        saved = (fact_checker_simple.DUCKDUCKGO_AVAILABLE, fact_checker_simple.ADAPTIVE_MAX_SOURCES,
+                 fact_checker_simple.ADAPTIVE_MAX_ROUNDS)
+        fact_checker_simple.DUCKDUCKGO_AVAILABLE = True
+        fact_checker_simple.ADAPTIVE_MAX_SOURCES = max_sources
+        fact_checker_simple.ADAPTIVE_MAX_ROUNDS = max_rounds
+        try:
+            sources = asyncio.run(pipeline._gather_evidence_adaptively("A claim"))
+        finally:
+            (fact_checker_simple.DUCKDUCKGO_AVAILABLE, fact_checker_simple.ADAPTIVE_MAX_SOURCES,
+             fact_checker_simple.ADAPTIVE_MAX_ROUNDS) = saved
+        return sources, requests, pipeline.gemini_model.prompts
+
+    # A confident first page is all that is fetched and classified
+    sources, requests, prompts = gather("SUPPORTS")
+    assert requests == [3] and len(sources) == 3 and len(prompts) == 1
+
+    # An uncertain verdict widens the search; only the new results are classified each round
+    sources, requests, prompts = gather("UNCLEAR")
+    print(f"Adaptive rounds requested {requests} results")
+    assert requests == [3, 6, 9] and len(sources) == 9
+    assert [p.count("Title:") for p in prompts] == [3, 3, 3]
+    assert len({s.link for s in sources}) == 9
+
+    # The source cap ends the search before the round limit
+    sources, requests, _ = gather("UNCLEAR", max_sources=5)
+    assert requests == [3, 5] and len(sources) == 5
+
+    # The round limit ends it before the source cap
+    sources, requests, _ = gather("UNCLEAR", max_rounds=2)
+    assert requests == [3, 6] and len(sources) == 6
+
+def test_fused_mode_labels_and_drafts_in_one_call():
+    def fused_reply(sources=None, posts=None):
+        def reply(prompt):
+            if "draft a social media fact-check post" not in prompt:
+                # Separate classification or post calls, made only on fallback
+                return label_all("REFUTES")(prompt) if "Title:" in prompt else "Separate post"
+            labels = {f"source_{i+1}": {"label": "SUPPORTS", "confidence": 0.9, "reasoning": "fused"}
+                      for i in range(prompt.count("Title:"))}
+            drafts = {verdict: f"{verdict} draft ({{confidence}} confidence)"
+                      for verdict in ("True", "False", "Misleading", "Unverified")}
+            return json.dumps({"sources": labels if sources is None else sources,
+                               "posts": drafts if posts is None else posts})
+        return reply
+
+    def check(reply):
+        pipeline = gemini_pipeline(reply)
+        pipeline._ddgs_text = lambda claim, max_results: [
+            {"title": s.title, "body": s.snippet, "href": s.link} for s in plain_sources(2)]
+        saved = fact_checker_simple.DUCKDUCKGO_AVAILABLE, fact_checker_simple.GEMINI_FUSED_MODE
+        fact_checker_simple.DUCKDUCKGO_AVAILABLE = fact_checker_simple.GEMINI_FUSED_MODE = True
+        try:
+            result = pipeline.process_claim("A claim", use_cache=False, stream=False, adaptive=False)
+        finally:
+            fact_checker_simple.DUCKDUCKGO_AVAILABLE, fact_checker_simple.GEMINI_FUSED_MODE = saved
+        return result, len(pipeline.gemini_model.prompts)
+
+    # The verdict is aggregated locally and picks its draft, with the confidence filled in
+    result, calls = check(fused_reply())
+    print(f"Fused post: {result.social_post!r}")
+    assert calls == 1
+    assert result.verdict == "True" and [s.reasoning for s in result.sources] == ["fused", "fused"]
+    assert result.social_post.startswith(f"True draft ({result.confidence:.0%} confidence)")
+
+    # Malformed labels: classified again on their own, and the post generated separately
+    result, calls = check(fused_reply(sources=[{"label": "SUPPORTS"}]))
+    assert calls == 3 and result.verdict == "False"
+    assert result.social_post.startswith("Separate post")
+
+    # Malformed drafts: the fused labels stand, only the post is generated separately
+    result, calls = check(fused_reply(posts="True draft"))
+    assert calls == 2 and result.verdict == "True"
+    assert [s.reasoning for s in result.sources] == ["fused", "fused"]
+    assert result.social_post.startswith("Separate post")
+
+def batch_reply(claims, bad_json=False):
+    """Reply to batch prompts labelling the given claim numbers; single-claim prompts get UNCLEAR."""
+    def reply(prompt):
+        if "CLAIM claim_" not in prompt:
+            return label_all("UNCLEAR")(prompt)
+        if bad_json:
+            return "Here are the results: claim_1 supports"
+        return json.dumps({f"claim_{n}": {"source_1": {"label": "SUPPORTS", "confidence": 0.9,
+                                                        "reasoning": "batched"}} for n in claims})
+    return reply
+
+def test_batch_reply_is_split_per_claim():
+    pipeline = gemini_pipeline(batch_reply([1, 2]))
+    pipeline.gemini_batcher = MicroBatcher(pipeline._classify_batch_with_gemini_async, window=0.05, max_batch=4)
+
+    async def classify_both():
+        return await asyncio.gather(pipeline.classify_sources_async("Claim one", plain_sources(1)),
+                                    pipeline.classify_sources_async("Claim two", plain_sources(1)))
+
+    first, second = asyncio.run(classify_both())
+    assert len(pipeline.gemini_model.prompts) == 1
+    assert first[0].reasoning == second[0].reasoning == "batched"
+    assert pipeline.gemini_batcher.stats()["average_batch_size"] == 2
+
+def test_batch_falls_back_to_single_claim_calls():
+    jobs = lambda: [("Claim one", plain_sources(1)), ("Claim two", plain_sources(1))]
+
+    # A claim missing from the reply is retried on its own
+    pipeline = gemini_pipeline(batch_reply([1]))
+    results = asyncio.run(pipeline._classify_batch_with_gemini_async(jobs()))
+    assert [r[0].reasoning for r in results] == ["batched", "fake"]
+    assert len(pipeline.gemini_model.prompts) == 2
+
+    # An unparseable reply sends every claim on its own
+    pipeline = gemini_pipeline(batch_reply([1, 2], bad_json=True))
+    results = asyncio.run(pipeline._classify_batch_with_gemini_async(jobs()))
+    assert [r[0].reasoning for r in results] == ["fake", "fake"]
+    assert len(pipeline.gemini_model.prompts) == 3
+
+def test_json_replies_are_repaired_and_counted():
+    payload = {"source_1": {"label": "SUPPORTS", "confidence": 0.8, "reasoning": "r"}}
+    fenced = f"```json\n{json.dumps(payload)}\n```"
+    prose = f"Here is my analysis: {json.dumps(payload)} Let me know if you need more."
+    assert extract_json_object(fenced) == extract_json_object(prose) == payload
+    # A brace inside the prose before the object is skipped
+    assert extract_json_object(f"Result {{see below}}: {json.dumps(payload)}") == payload
+
+    pipeline = gemini_pipeline(label_all("SUPPORTS"))
+    assert pipeline._parse_gemini_json(json.dumps(payload)) == payload
+    assert pipeline._parse_gemini_json(fenced) == payload
+    assert pipeline._parse_gemini_json(prose) == payload
+    for bad in ("I cannot classify these sources.", "[1, 2, 3]", "{truncated"):
+        try:
+            pipeline._parse_gemini_json(bad)
+            assert False, f"parsed {bad!r}"
+        except ValueError:
+            pass
+
+    stats = pipeline.json_parse_stats()
+    print(f"JSON parse stats: {stats}")
+    assert (stats["clean"], stats["repaired"], stats["failed"]) == (1, 2, 3)
+    assert stats["failure_rate"] == 0.5
+
+if __name__ == "__main__":
+    test_sync_calls_reuse_gemini_across_event_loops()
+    test_unparseable_replies_are_not_cached()
+    test_streaming_early_exit_returns_settled_verdict()
+    test_cascade_counts_local_labels_and_avoided_calls()
+    test_adaptive_search_widens_only_while_uncertain()
+    test_fused_mode_labels_and_drafts_in_one_call()
+    test_batch_reply_is_split_per_claim()
+    test_batch_falls_back_to_single_claim_calls()
+    test_json_replies_are_repaired_and_counted()
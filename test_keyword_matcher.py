@@ -0,0 +1,110 @@
+"""
+Tests for the compiled keyword matcher
+"""
+
+import os
+import json
+import time
+import random
+import tempfile
+
+from keyword_matcher import AhoCorasick, CompiledLexicon, LexiconManager
+from fact_checker_simple import DEMO_SOURCES
+from config import KEYWORD_LEXICON_PATH, SAMPLE_CLAIMS
+
+with open(KEYWORD_LEXICON_PATH, encoding="utf-8") as f:
+    KEYWORD_LEXICON = json.load(f)
+
+def reference_route(lexicon, claim_lower):
+    """Reference implementation: the original sequential substring checks."""
+    for route in lexicon["routes"]:
+        if any(word in claim_lower for word in route["triggers"]):
+            return route["domain"]
+    return lexicon["default_domain"]
+
+def reference_score(lexicon, domain, text_lower):
+    keywords = lexicon["domains"][domain]
+    support = sum(1 for keyword in keywords["support"] if keyword in text_lower)
+    refute = sum(1 for keyword in keywords["refute"] if keyword in text_lower)
+    return support, refute
+
+def test_aho_corasick_overlapping_patterns():
+    automaton = AhoCorasick(["he", "she", "his", "hers", "s"])
+    assert automaton.find("ushers") == {0, 1, 3, 4}
+    assert automaton.find("xyz") == set()
+
+def test_compiled_lexicon_matches_substring_scan():
+    lexicon = CompiledLexicon(KEYWORD_LEXICON)
+    texts = [claim.lower() for claim in SAMPLE_CLAIMS]
+    for entry in DEMO_SOURCES.values():
+        for source in entry["sources"]:
+            texts += [source["title"].lower(), source["snippet"].lower()]
+
+    rng = random.Random(3)
+    phrases = [p for d in KEYWORD_LEXICON["domains"].values() for p in d["support"] + d["refute"]]
+    phrases += [t for r in KEYWORD_LEXICON["routes"] for t in r["triggers"]] + ["the", "not", "no", "x"]
+    texts += [" ".join(rng.choices(phrases, k=rng.randint(0, 8))) for _ in range(300)]
+
+    for text in texts:
+        assert lexicon.route(text) == reference_route(KEYWORD_LEXICON, text), text
+        for domain in KEYWORD_LEXICON["domains"]:
+            assert lexicon.score(domain, text) == reference_score(KEYWORD_LEXICON, domain, text), text
+    print(f"Compiled lexicon matches the substring scan on {len(texts)} texts")
+
+def test_lexicon_snapshot_and_hot_reload():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "lexicon.json")
+        snapshots = os.path.join(tmp, "snapshots")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(KEYWORD_LEXICON, f)
+
+        manager = LexiconManager(path, snapshots, reload_interval=0.01)
+        assert len(os.listdir(snapshots)) == 1
+        old = manager.current()
+        assert old.score("scientific", "a debunked myth") == (0, 2)
+
+        # A second worker starts from the cached snapshot (plain JSON tables, not pickle)
+        assert os.listdir(snapshots)[0].endswith(".json")
+        restored = LexiconManager(path, snapshots, reload_interval=0).current()
+        assert restored.version == old.version
+        assert restored.route("is the vaccine safe") == old.route("is the vaccine safe")
+        assert restored.score("scientific", "a debunked myth") == (0, 2)
+
+        changed = dict(KEYWORD_LEXICON, version=2)
+        changed["domains"] = dict(KEYWORD_LEXICON["domains"])
+        changed["domains"]["scientific"] = {"support": ["myth"], "refute": []}
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(changed, f)
+
+        deadline = time.time() + 5
+        while manager.current() is old and time.time() < deadline:
+            time.sleep(0.02)
+        assert manager.current().version == 2
+        assert manager.current().score("scientific", "a debunked myth") == (1, 0)
+        print(f"Lexicon reloaded {manager.reloads} time(s)")
+
+def test_batched_keyword_classification_matches_scalar_path():
+    from fact_checker_simple import FactCheckerPipeline, Source
+
+    pipeline = FactCheckerPipeline()
+    rng = random.Random(5)
+    phrases = [p for d in KEYWORD_LEXICON["domains"].values() for p in d["support"] + d["refute"]] + ["plain"]
+    batch = []
+    for claim in SAMPLE_CLAIMS * 5:
+        sources = [Source(title=" ".join(rng.choices(phrases, k=rng.randint(0, 3))),
+                          snippet=" ".join(rng.choices(phrases, k=rng.randint(0, 6))),
+                          link="https://example.com") for _ in range(rng.randint(0, 6))]
+        batch.append((claim, sources))
+
+    expected = [[(s.label, s.confidence, s.reasoning) for s in pipeline._classify_with_keywords(
+        claim, [Source(s.title, s.snippet, s.link) for s in sources])] for claim, sources in batch]
+    actual = [[(s.label, s.confidence, s.reasoning) for s in sources]
+              for sources in pipeline.classify_batch_with_keywords(batch)]
+    assert actual == expected
+    print(f"Batched classification matches on {sum(len(s) for _, s in batch)} sources")
+
+if __name__ == "__main__":
+    test_aho_corasick_overlapping_patterns()
+    test_compiled_lexicon_matches_substring_scan()
+    test_lexicon_snapshot_and_hot_reload()
+    test_batched_keyword_classification_matches_scalar_path()
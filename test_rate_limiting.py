@@ -0,0 +1,144 @@
+"""
+Tests for the backend rate limiters
+"""
+
+import os
+import time
+import asyncio
+import sqlite3
+import tempfile
+import threading
+
+from rate_limiting import BackendLimiter, LimiterTimeout, SQLiteTokenBucket, TokenBucket
+
+def test_token_bucket():
+    bucket = TokenBucket(rate=10, capacity=2)
+    assert bucket.try_acquire() == 0.0
+    assert bucket.try_acquire() == 0.0
+
+    # Burst exhausted: next token arrives after roughly 1/rate seconds
+    wait = bucket.try_acquire()
+    assert 0 < wait <= 0.1
+
+    start = time.monotonic()
+    bucket.acquire()
+    assert time.monotonic() - start >= 0.05
+
+def test_sqlite_bucket_shared_between_connections():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "rate_limits.sqlite3")
+        # Separate connections stand in for separate worker processes
+        first = SQLiteTokenBucket(path, "search", rate=1, capacity=3)
+        second = SQLiteTokenBucket(path, "search", rate=1, capacity=3)
+        other = SQLiteTokenBucket(path, "gemini", rate=1, capacity=1)
+
+        assert first.try_acquire() == 0.0
+        assert second.try_acquire() == 0.0
+        assert first.try_acquire() == 0.0
+        assert second.try_acquire() > 0
+        assert other.try_acquire() == 0.0
+
+        for bucket in (first, second, other):
+            bucket.close()
+
+def test_sqlite_bucket_waits_off_the_event_loop():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "rate_limits.sqlite3")
+        bucket = SQLiteTokenBucket(path, "search", rate=1, capacity=3)
+        # Another process holds the write lock for a while
+        other = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        other.execute("BEGIN IMMEDIATE")
+        threading.Timer(0.3, lambda: other.execute("COMMIT")).start()
+
+        async def run():
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    await asyncio.sleep(0.02)
+                    ticks += 1
+
+            task = asyncio.create_task(ticker())
+            await bucket.acquire_async()
+            task.cancel()
+            return ticks
+
+        ticks = asyncio.run(run())
+        assert ticks >= 5, f"event loop stalled while waiting on the lock ({ticks} ticks)"
+        other.close()
+        bucket.close()
+
+def test_limiter_shared_across_threads_and_tasks():
+    limiter = BackendLimiter("test", rate=0, burst=0, max_concurrency=2)
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def enter():
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+
+    def leave():
+        nonlocal active
+        with lock:
+            active -= 1
+
+    def thread_call():
+        with limiter:
+            enter()
+            time.sleep(0.01)
+            leave()
+
+    async def task_call():
+        async with limiter:
+            enter()
+            await asyncio.sleep(0.01)
+            leave()
+
+    async def run_tasks():
+        await asyncio.gather(*(task_call() for _ in range(6)))
+
+    threads = [threading.Thread(target=thread_call) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    asyncio.run(run_tasks())
+    for thread in threads:
+        thread.join()
+
+    stats = limiter.stats()
+    print(f"Limiter stats: {stats}")
+    assert peak <= 2
+    assert stats["acquisitions"] == 12
+    assert stats["max_wait"] > 0
+
+def test_limiter_hand_off_and_queue_timeout():
+    limiter = BackendLimiter("test", rate=1, burst=1, max_concurrency=1)
+
+    async def run():
+        await limiter.acquire_async()
+        # Slot taken: neither an immediate nor a bounded acquisition gets through
+        assert not await limiter.try_acquire_async()
+        try:
+            await limiter.acquire_async(timeout=0.05)
+            assert False, "acquired a taken slot"
+        except LimiterTimeout:
+            pass
+        # Released from another thread, as the search worker does
+        await asyncio.to_thread(limiter.release)
+        # The slot is free again but the token is spent, so the slot is not kept
+        assert not await limiter.try_acquire_async()
+        await limiter.acquire_async(timeout=2)
+        limiter.release()
+
+    asyncio.run(run())
+    assert limiter.stats()["acquisitions"] == 2
+
+if __name__ == "__main__":
+    test_token_bucket()
+    test_sqlite_bucket_shared_between_connections()
+    test_sqlite_bucket_waits_off_the_event_loop()
+    test_limiter_shared_across_threads_and_tasks()
+    test_limiter_hand_off_and_queue_timeout()
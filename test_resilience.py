@@ -0,0 +1,107 @@
+"""
+Tests for latency tracking, the circuit breaker and the SLO controller
+"""
+
+import time
+
+from resilience import CircuitBreaker, LatencyTracker, SLOController
+
+def test_latency_tracker():
+    tracker = LatencyTracker(window=100, min_samples=10)
+    assert tracker.percentile(0.95, default=2.0) == 2.0
+
+    for ms in range(1, 101):
+        tracker.record(ms / 1000)
+    assert tracker.percentile(0.5, default=2.0) == 0.051
+    assert tracker.percentile(0.95, default=2.0) == 0.096
+    print(f"Latency stats: {tracker.stats()}")
+
+def test_circuit_breaker():
+    breaker = CircuitBreaker(failure_threshold=2, cooldown=0.05)
+    assert breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert not breaker.allow()  # open: straight to the fallback
+
+    # After the cooldown a single probe goes through
+    time.sleep(0.06)
+    assert breaker.allow()
+    assert not breaker.allow()
+
+    # A failed probe re-opens immediately
+    breaker.record_failure()
+    assert not breaker.allow()
+
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.allow() and breaker.allow()
+
+    stats = breaker.stats()
+    print(f"Breaker stats: {stats}")
+    assert stats["state"] == "closed" and stats["trips"] == 1
+
+def test_slo_controller_degrades_and_recovers():
+    slo = SLOController("test", latency_slo=0.05, max_error_rate=0.2, window=10,
+                        min_samples=5, probe_interval=0.1)
+    for _ in range(4):
+        slo.record(0.01, ok=True)
+    assert slo.allow()
+
+    # p95 over the SLO: new work is routed to the fallback
+    slo.record(0.5, ok=True)
+    assert not slo.allow()
+
+    # One probe per interval; a slow probe keeps the backend degraded
+    time.sleep(0.11)
+    assert slo.allow()
+    assert not slo.allow()
+    time.sleep(0.07)
+    slo.record(0.06, ok=True)
+    assert not slo.allow()
+
+    time.sleep(0.11)
+    assert slo.allow()
+    time.sleep(0.02)
+    slo.record(0.01, ok=True)
+    assert slo.allow() and slo.allow()
+
+    # Error rate breaches degrade as well
+    for ok in (True, True, True, False, False):
+        slo.record(0.01, ok=ok)
+    stats = slo.stats()
+    print(f"SLO stats: {stats}")
+    assert stats["degraded"] and stats["degradations"] == 2
+
+def test_slo_controller_ignores_in_flight_calls_while_degraded():
+    slo = SLOController("test", latency_slo=1.0, max_error_rate=0.2, window=10,
+                        min_samples=5, probe_interval=0.05)
+    for ok in (True, True, True, False, False):
+        slo.record(0.01, ok=ok)
+    assert not slo.allow()
+
+    # A fast success from a call that started before the degradation is not a probe
+    time.sleep(0.02)
+    slo.record(0.02, ok=True)
+    assert not slo.allow() and slo.stats()["probes"] == 0
+
+    # A failed probe keeps the backend degraded; a healthy one restores it
+    time.sleep(0.06)
+    assert slo.allow()
+    time.sleep(0.01)
+    slo.record(0.005, ok=False)
+    slo.record(0.005, ok=True)  # a second outcome after the probe is not counted either
+    assert slo.stats()["degraded"]
+    time.sleep(0.06)
+    assert slo.allow()
+    time.sleep(0.01)
+    slo.record(0.005, ok=True)
+    assert slo.allow() and slo.stats()["probes"] == 2
+
+if __name__ == "__main__":
+    test_latency_tracker()
+    test_circuit_breaker()
+    test_slo_controller_degrades_and_recovers()
+    test_slo_controller_ignores_in_flight_calls_while_degraded()
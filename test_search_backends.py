@@ -0,0 +1,179 @@
+"""
+Tests for the pluggable search backends and hedged live search
+"""
+
+import os
+import json
+import time
+import asyncio
+import tempfile
+
+import fact_checker_simple
+from claim_index import NearDuplicateIndex
+from evidence_index import DemoSourceIndex
+from fact_checker_simple import DEMO_SOURCES, FactCheckerPipeline
+from rate_limiting import BackendLimiter
+from resilience import CircuitBreaker
+from search_backends import ArchiveBackend, DemoCorpusBackend, SearchBackend, canonical_url, merge_results
+
+def test_merge_results_dedupes_by_url():
+    assert canonical_url("https://WWW.Example.com/page/#top") == canonical_url("https://example.com/page")
+    first = [{"title": "A", "body": "a", "href": "https://www.example.com/a/"}]
+    second = [{"title": "A again", "body": "a", "href": "https://example.com/a"},
+              {"title": "B", "body": "b", "href": "https://example.com/b"}]
+    merged = merge_results([first, second])
+    assert [r["title"] for r in merged] == ["A", "B"]
+
+def test_local_backends():
+    demo = DemoCorpusBackend(DemoSourceIndex(DEMO_SOURCES))
+    results = demo.search("Water boils at 100°C at sea level.", max_results=2)
+    assert len(results) == 2 and all(set(r) == {"title", "body", "href"} for r in results)
+    assert demo.search("zzz qqq", max_results=2) == []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "archive.jsonl")
+        assert not ArchiveBackend(path).available()
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"title": "Chromosome count", "snippet": "Humans have 46 chromosomes",
+                                "link": "https://archive.example/chromosomes"}) + "\n")
+            f.write(json.dumps({"title": "Lightning", "snippet": "Lightning strikes tall towers repeatedly",
+                                "link": "https://archive.example/lightning"}) + "\n")
+        archive = ArchiveBackend(path)
+        results = archive.search("Humans have 48 chromosomes.", max_results=5)
+        print(f"Archive results: {results}")
+        assert [r["href"] for r in results] == ["https://archive.example/chromosomes"]
+
+class FakeLiveBackend(SearchBackend):
+    name = "fake-live"
+    live = True
+
+    def search(self, query, max_results):
+        return [{"title": "Live result", "body": "From the web", "href": "https://example.com/live"}]
+
+def test_fan_out_caches_only_live_results():
+    pipeline = FactCheckerPipeline()
+    pipeline.search_cache = None
+    pipeline.claim_index = NearDuplicateIndex(threshold=0.75)
+    pipeline.search_backends = [DemoCorpusBackend(pipeline.demo_index)]
+    pipeline.backend_breakers = {"demo": CircuitBreaker(3, 30), "fake-live": CircuitBreaker(3, 30)}
+
+    fan_out = fact_checker_simple.SEARCH_FANOUT
+    fact_checker_simple.SEARCH_FANOUT = True
+    try:
+        # Canned evidence alone is returned but not remembered
+        sources = pipeline.search_claim("Water boils at 100°C at sea level.")
+        assert sources and len(pipeline.claim_index) == 0
+
+        pipeline.search_backends.append(FakeLiveBackend())
+        sources = pipeline.search_claim("Water boils at 100°C at sea level.")
+        assert "https://example.com/live" in [s.link for s in sources]
+        assert len(pipeline.claim_index) == 1
+    finally:
+        fact_checker_simple.SEARCH_FANOUT = fan_out
+
+class FakeLocalBackend(SearchBackend):
+    name = "fake-local"
+
+    def search(self, query, max_results):
+        # Two of these are incomplete and must not count towards the quorum
+        return ([{"title": f"Local {i}", "body": "From disk", "href": f"https://local.example/{i}"} for i in range(4)]
+                + [{"title": "No snippet", "body": "", "href": "https://local.example/empty"},
+                   {"title": "", "body": "No title", "href": "https://local.example/untitled"}])
+
+class SlowLiveBackend(FakeLiveBackend):
+    def __init__(self, delay):
+        self.delay = delay
+
+    def search(self, query, max_results):
+        time.sleep(self.delay)
+        return super().search(query, max_results)
+
+def test_fan_out_quorum_waits_for_live_results():
+    def fan_out(live_delay, grace):
+        pipeline = FactCheckerPipeline()
+        pipeline.search_cache = None
+        pipeline.claim_index = NearDuplicateIndex(threshold=0.75)
+        pipeline.search_backends = [FakeLocalBackend(), SlowLiveBackend(live_delay)]
+        pipeline.backend_breakers = {"fake-local": CircuitBreaker(3, 30), "fake-live": CircuitBreaker(3, 30)}
+        saved = fact_checker_simple.SEARCH_FANOUT, fact_checker_simple.SEARCH_FANOUT_LIVE_GRACE
+        fact_checker_simple.SEARCH_FANOUT = True
+        fact_checker_simple.SEARCH_FANOUT_LIVE_GRACE = grace
+        try:
+            sources = pipeline.search_claim("Water boils at 100°C at sea level.", max_results=4)
+        finally:
+            fact_checker_simple.SEARCH_FANOUT, fact_checker_simple.SEARCH_FANOUT_LIVE_GRACE = saved
+        return [s.link for s in sources], len(pipeline.claim_index)
+
+    # Local results meet the quorum at once, but the live answer within the grace period is kept and cached
+    links, cached = fan_out(live_delay=0.1, grace=1.0)
+    assert links == ["https://example.com/live", "https://local.example/0", "https://local.example/1",
+                     "https://local.example/2"]
+    assert cached == 1
+
+    # A live backend slower than the grace period is not waited for; local evidence is not cached
+    start = time.time()
+    links, cached = fan_out(live_delay=0.5, grace=0.1)
+    assert time.time() - start < 0.45
+    assert links == [f"https://local.example/{i}" for i in range(4)] and cached == 0
+
+def hedged_search(delays, claims, max_concurrency, timeout):
+    """Search the claims concurrently against a fake live search whose n-th call takes delays(n) seconds."""
+    pipeline = FactCheckerPipeline()
+    pipeline.search_cache = None
+    pipeline.claim_index = None
+    pipeline.search_limiter = BackendLimiter("search", rate=0, burst=0, max_concurrency=max_concurrency)
+    calls = []
+
+    def fake_search(claim, max_results):
+        calls.append(claim)
+        time.sleep(delays(len(calls)))
+        return [{"title": claim, "body": "From the web", "href": f"https://example.com/live/{len(calls)}"}]
+
+    pipeline._ddgs_text = fake_search
+
+    async def search_all():
+        return await asyncio.gather(*(pipeline.search_claim_async(claim, 5, use_cache=False) for claim in claims))
+
+    saved = (fact_checker_simple.DUCKDUCKGO_AVAILABLE, fact_checker_simple.SEARCH_TIMEOUT,
+             fact_checker_simple.SEARCH_HEDGE_DEFAULT_DELAY)
+    fact_checker_simple.DUCKDUCKGO_AVAILABLE = True
+    fact_checker_simple.SEARCH_TIMEOUT = timeout
+    fact_checker_simple.SEARCH_HEDGE_DEFAULT_DELAY = 0.1
+    try:
+        results = asyncio.run(search_all())
+    finally:
+        (fact_checker_simple.DUCKDUCKGO_AVAILABLE, fact_checker_simple.SEARCH_TIMEOUT,
+         fact_checker_simple.SEARCH_HEDGE_DEFAULT_DELAY) = saved
+    live = [any("example.com/live" in s.link for s in sources) for sources in results]
+    return pipeline, calls, live
+
+def test_hedged_search_does_not_count_local_queueing():
+    # Four claims share two slots: the last two queue for 0.4s, then take 0.4s against a 0.6s timeout
+    pipeline, calls, live = hedged_search(lambda n: 0.4, [f"Claim {i}" for i in range(4)],
+                                          max_concurrency=2, timeout=0.6)
+    health = pipeline.search_health()
+    print(f"Search health under queueing: {health['hedging']}, {health['breaker']}")
+    assert all(live) and len(calls) == 4
+    # No slot is free when the hedge delay passes, so no hedge is sent
+    assert health["hedging"] == {"hedges": 0, "skipped": 4}
+    assert health["breaker"]["consecutive_failures"] == 0
+    assert max(pipeline.search_latency.samples) < 0.55
+
+    # With a free slot, a slow request is hedged and the faster answer wins
+    pipeline, calls, live = hedged_search(lambda n: 0.6 if n == 1 else 0.05, ["Claim"],
+                                          max_concurrency=2, timeout=1.0)
+    assert live == [True] and len(calls) == 2
+    assert pipeline.search_health()["hedging"]["hedges"] == 1
+
+    # Waiting out SEARCH_TIMEOUT in the local queue falls back without blaming the backend
+    pipeline, calls, live = hedged_search(lambda n: 0.15, ["Claim one", "Claim two", "Claim three"],
+                                          max_concurrency=1, timeout=0.2)
+    assert sorted(live) == [False, True, True] and len(calls) == 2
+    assert pipeline.search_health()["breaker"]["consecutive_failures"] == 0
+
+if __name__ == "__main__":
+    test_merge_results_dedupes_by_url()
+    test_local_backends()
+    test_fan_out_caches_only_live_results()
+    test_fan_out_quorum_waits_for_live_results()
+    test_hedged_search_does_not_count_local_queueing()
@@ -0,0 +1,85 @@
+"""
+Tests for streaming search and classification
+"""
+
+import time
+import asyncio
+
+import fact_checker_simple
+from caching import SearchCache
+from claim_index import NearDuplicateIndex
+from fact_checker_simple import FactCheckerPipeline
+
+CLAIM = "Humans have 48 chromosomes."
+
+RESULTS = [
+    {"title": "Chromosome count", "body": "Humans have 46 chromosomes", "href": "https://example.com/1"},
+    {"title": "Incomplete result", "body": "", "href": "https://example.com/2"},
+    {"title": "Karyotype basics", "body": "A normal karyotype has 46 chromosomes", "href": "https://example.com/3"},
+]
+
+def live_pipeline(ddgs_iter):
+    """Pipeline whose live search is replaced by ddgs_iter, with the shared caches turned off."""
+    pipeline = FactCheckerPipeline()
+    pipeline.search_cache = None
+    pipeline.result_cache = None
+    pipeline.claim_index = None
+    pipeline._ddgs_iter = ddgs_iter
+    return pipeline
+
+def with_live_search(fn):
+    """Run fn with the live-search flag forced on (the client itself is faked)."""
+    live = fact_checker_simple.DUCKDUCKGO_AVAILABLE
+    fact_checker_simple.DUCKDUCKGO_AVAILABLE = True
+    try:
+        return fn()
+    finally:
+        fact_checker_simple.DUCKDUCKGO_AVAILABLE = live
+
+def test_iter_search_claim_yields_live_then_falls_back():
+    pipeline = live_pipeline(lambda claim, max_results: iter(RESULTS))
+    sources = with_live_search(lambda: list(pipeline.iter_search_claim(CLAIM)))
+    assert [s.link for s in sources] == ["https://example.com/1", "https://example.com/3"]
+
+    def failing(claim, max_results):
+        yield RESULTS[0]
+        raise ConnectionError("rate limited")
+
+    pipeline = live_pipeline(failing)
+    pipeline.search_cache = SearchCache(":memory:", ttl=60, max_entries=10)
+    pipeline.claim_index = NearDuplicateIndex()
+    sources = with_live_search(lambda: list(pipeline.iter_search_claim(CLAIM)))
+    # Sources already yielded stand; the failure is counted by the breaker
+    assert [s.link for s in sources] == ["https://example.com/1"]
+    assert pipeline.search_health()["breaker"]["consecutive_failures"] == 1
+
+    # The truncated list is not cached: the next search goes live and gets every result
+    pipeline._ddgs_text = lambda claim, max_results: list(RESULTS)
+    sources = with_live_search(lambda: pipeline.search_claim(CLAIM))
+    assert [s.link for s in sources] == ["https://example.com/1", "https://example.com/3"]
+    assert pipeline.search_cache.stats()["hits"] == 0
+    pipeline.search_cache.close()
+
+def test_search_claim_stream_enforces_search_timeout():
+    def hanging(claim, max_results):
+        time.sleep(1.0)
+        yield from RESULTS
+
+    async def collect(pipeline):
+        return [source async for source in pipeline.search_claim_stream(CLAIM)]
+
+    pipeline = live_pipeline(hanging)
+    timeout = fact_checker_simple.SEARCH_TIMEOUT
+    fact_checker_simple.SEARCH_TIMEOUT = 0.2
+    try:
+        start = time.time()
+        sources = with_live_search(lambda: asyncio.run(collect(pipeline)))
+    finally:
+        fact_checker_simple.SEARCH_TIMEOUT = timeout
+    print(f"Stream fell back after {time.time() - start:.2f}s: {[s.title for s in sources]}")
+    assert time.time() - start < 0.9
+    assert sources and all("example.com" not in s.link for s in sources)
+
+if __name__ == "__main__":
+    test_iter_search_claim_yields_live_then_falls_back()
+    test_search_claim_stream_enforces_search_timeout()
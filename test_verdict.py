@@ -0,0 +1,28 @@
+"""
+Tests for incremental verdict evaluation
+"""
+
+from fact_checker_simple import IncrementalVerdict, Source
+
+def labeled(*labels):
+    return [Source(title="t", snippet="s", link="l", label=label) for label in labels]
+
+def test_incremental_verdict_settles_only_when_bucket_is_fixed():
+    tracker = IncrementalVerdict(expected_sources=6)
+    tracker.add(labeled("refutes", "refutes"))
+    # Two refutes look like "False", but a later support would make it "Misleading"
+    assert not tracker.settled()
+
+    tracker.add(labeled("supports"))
+    assert tracker.settled()  # Misleading cannot change
+
+    tracker = IncrementalVerdict(expected_sources=1)
+    assert tracker.settled()  # one source can never reach True or False
+
+    tracker = IncrementalVerdict(expected_sources=3)
+    tracker.add(labeled("unclear", "unclear"))
+    assert tracker.settled()
+    print("Incremental verdict settles correctly")
+
+if __name__ == "__main__":
+    test_incremental_verdict_settles_only_when_bucket_is_fixed()